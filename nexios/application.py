@@ -773,6 +773,9 @@ class NexiosApp(object):
     
     def url_for(self, _name: str, **path_params: Any) -> URLPath:
         return self.router.url_for(_name,**path_params)
+
+    def static_url(self, _name: str, path: str) -> URLPath:
+        return self.router.static_url(_name, path)
     
     
    
@@ -23,6 +23,10 @@ class NotFoundException(HTTPException):
     def __init__(self, detail: typing.Optional[str] = None, headers: typing.Dict[str, typing.Any] = {}) -> None:
         super().__init__(status_code=404, detail=detail or "Not Found", headers=headers)
 
+class RequestEntityTooLarge(HTTPException):
+    def __init__(self, detail: typing.Optional[str] = None, headers: typing.Dict[str, typing.Any] = {}) -> None:
+        super().__init__(status_code=413, detail=detail or "Request Entity Too Large", headers=headers)
+
 class WebSocketException(Exception):
     def __init__(self, code: int, reason: typing.Optional[str] = None) -> None:
         super().__init__(reason or "")
@@ -1,9 +1,11 @@
 
-from functools import wraps, lru_cache
+from functools import wraps
+from collections import OrderedDict
 import asyncio
 import time
-from typing import Callable, Optional, Awaitable, List, Any, Dict
+from typing import Callable, Hashable, Optional, Awaitable, List, Any, Dict, Tuple
 from nexios.http import Request, Response
+from nexios.http.response import BaseResponse, FileResponse, PreencodedResponse, StreamingResponse
 from nexios.logging import getLogger
 
 logger = getLogger("nexios")
@@ -108,17 +110,118 @@ def analytics(func: HandlerType) -> HandlerType:
     return wrapper
 
 
-def cache_response(max_size: int = 128):
+def _default_cache_key(req: Request, vary: Optional[List[str]]) -> Hashable:
+    return (
+        req.method,
+        req.url.path,
+        tuple(sorted(req.query_params.multi_items())),
+        tuple(req.headers.get(name) for name in vary or ()),
+    )
+
+
+def cache_response(
+    max_size: int = 128,
+    *,
+    ttl: Optional[float] = 60,
+    key: Optional[Callable[[Request], Hashable]] = None,
+    vary: Optional[List[str]] = None,
+    methods: Tuple[str, ...] = ("GET", "HEAD"),
+    clock: Callable[[], float] = time.monotonic,
+):
     """
-    A decorator to cache responses in memory.
+    A decorator to cache handler responses in memory.
+
+    :param max_size: Maximum number of cached responses; the least recently used is evicted first.
+    :param ttl: Seconds a cached response stays fresh, or None to keep it until evicted.
+    :param key: A function building the cache key from the request. Defaults to the
+        method, path and query string.
+    :param vary: Request headers whose values are added to the default key (e.g. ["accept-language"]).
+    :param methods: The HTTP methods that are cached.
+    :param clock: The monotonic time source used for expiry.
+
+    Only complete 200 responses without cookies are cached. Concurrent misses for the
+    same key run the handler once and share its result. `wrapper.cache_clear()` empties the cache.
     """
 
-    def decorator(handler: HandlerType):
-        cached_func = lru_cache(maxsize=max_size)(handler)
-        return cached_func
+    def decorator(handler: HandlerType) -> HandlerType:
+        cache: "OrderedDict[Hashable, Tuple[float, PreencodedResponse]]" = OrderedDict()
+        in_flight: Dict[Hashable, "asyncio.Future[Optional[PreencodedResponse]]"] = {}
+
+        def lookup(cache_key: Hashable) -> Optional[PreencodedResponse]:
+            entry = cache.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, cached = entry
+            if ttl is not None and expires_at <= clock():
+                del cache[cache_key]
+                return None
+            cache.move_to_end(cache_key)
+            return cached
+
+        def store(cache_key: Hashable, res: Response) -> Optional[PreencodedResponse]:
+            response = res.get_response()
+            if (
+                response.status_code != 200
+                or isinstance(response, (StreamingResponse, FileResponse))
+                or "set-cookie" in res.headers
+                or "set-cookie" in {name.lower() for name in response.headers}
+            ):
+                return None
+            if response._auto_etag and "etag" not in response._header_store:
+                # Hits are replayed as they were frozen, so the ETag has to be part of them.
+                response.header("etag", response._generate_etag())
+            frozen = response if isinstance(response, PreencodedResponse) else PreencodedResponse.from_response(response)
+            cache[cache_key] = (clock() + (ttl or 0), frozen)
+            cache.move_to_end(cache_key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+            return frozen
+
+        def replay(req: Request, res: Response, cached: PreencodedResponse) -> Response:
+            if cached._is_not_modified(req.scope):
+                not_modified = BaseResponse(status_code=304)
+                not_modified._headers = cached._not_modified_headers()
+                return res.make_response(not_modified)
+            return res.make_response(cached)
 
-    return decorator
+        @wraps(handler)
+        async def wrapper(*args: List[Any], **kwargs: Dict[str, Any]):
+            req: Request = args[-2]  # type:ignore
+            res: Response = args[-1]  # type:ignore
+            if req.method.upper() not in methods:
+                return await handler(*args, **kwargs)
+
+            cache_key = key(req) if key else _default_cache_key(req, vary)
+            cached = lookup(cache_key)
+            if cached is not None:
+                return replay(req, res, cached)
+
+            pending = in_flight.get(cache_key)
+            if pending is not None:
+                cached = await asyncio.shield(pending)
+                if cached is not None:
+                    return replay(req, res, cached)
+                # The leader's response wasn't cacheable; produce our own.
+                return await handler(*args, **kwargs)
+
+            future: "asyncio.Future[Optional[PreencodedResponse]]" = asyncio.get_running_loop().create_future()
+            in_flight[cache_key] = future
+            cached = None
+            try:
+                result = await handler(*args, **kwargs)
+                cached = store(cache_key, res)
+                return result
+            finally:
+                del in_flight[cache_key]
+                future.set_result(cached)
 
+        def cache_clear() -> None:
+            cache.clear()
+
+        wrapper.cache_clear = cache_clear  # type:ignore
+        return wrapper
+
+    return decorator
 
 
 def request_timeout(timeout: int):
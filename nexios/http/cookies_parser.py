@@ -1,34 +1,72 @@
 import typing
-from urllib.parse import unquote
+from http import cookies as http_cookies
 
 
-def parse_cookies(
-    cookie_string: typing.Union[str, None],
-) -> typing.Dict[str, typing.Any]:
+class RequestCookies(typing.Mapping[str, str]):
     """
-    Parses a ``Cookie`` HTTP header into a dictionary of key/value pairs.
+    A read-only mapping over a ``Cookie`` HTTP header.
+
+    It attempts to mimic browser cookie parsing behavior: browsers and web servers
+    frequently disregard the spec (RFC 6265) when setting and reading cookies,
+    so we attempt to suit the common scenarios here.
 
-    Mimics browser cookie parsing behavior, which is often less strict than the spec (RFC 6265).
-    This function handles common scenarios that browsers and web servers often ignore in cookie parsing.
+    The header is only split into name/value pairs on first access, and a
+    value is only unquoted when that cookie is actually read, so requests
+    carrying many cookies the app never looks at stay cheap.
 
-    Adapted from Django 3.1.0, but avoids using outdated `SimpleCookie.load`.
+    Adapted from Django 3.1.0.
+    Note: we are explicitly _NOT_ using `SimpleCookie.load` because it is based
+    on an outdated spec and will fail on lots of input we want to support
     """
 
-    if cookie_string is None:
-        return {}
-    cookie_dict: typing.Dict[str, typing.Optional[str]] = {}
+    def __init__(self, cookie_string: typing.Optional[str] = None) -> None:
+        self._cookie_string = cookie_string or ""
+        self._raw: typing.Optional[typing.Dict[str, str]] = None
+        self._values: typing.Dict[str, str] = {}
+
+    def _split(self) -> typing.Dict[str, str]:
+        if self._raw is None:
+            raw: typing.Dict[str, str] = {}
+            for chunk in self._cookie_string.split(";"):
+                if "=" in chunk:
+                    key, val = chunk.split("=", 1)
+                else:
+                    # Assume an empty name per
+                    # https://bugzilla.mozilla.org/show_bug.cgi?id=169091
+                    key, val = "", chunk
+                key, val = key.strip(), val.strip()
+                if key or val:
+                    raw[key] = val
+            self._raw = raw
+        return self._raw
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        # unquote using Python's algorithm.
+        value = http_cookies._unquote(self._split()[key])  # type:ignore
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._split()
 
-    for chunk in cookie_string.split(";"):
-        chunk = chunk.strip()
-        if "=" in chunk:
-            key, val = chunk.split("=", 1)
-        else:
-            key, val = "", chunk
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._split())
 
-        key = key.strip()
-        val = val.strip()
+    def __len__(self) -> int:
+        return len(self._split())
 
-        if key or val:
-            cookie_dict[key] = unquote(val) if val else None
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
 
-    return cookie_dict
+
+def parse_cookies(
+    cookie_string: typing.Union[str, None],
+) -> typing.Dict[str, str]:
+    """
+    Parses a ``Cookie`` HTTP header into a dictionary of key/value pairs.
+    """
+    return dict(RequestCookies(cookie_string))
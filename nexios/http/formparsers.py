@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import codecs
 import typing
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from tempfile import SpooledTemporaryFile
 from urllib.parse import unquote_plus
 
-from nexios.structs import FormData, Headers, UploadedFile
+from nexios.exceptions import HTTPException, RequestEntityTooLarge
+from nexios.structs import ContentType, FormData, Headers, UploadedFile
 
 if typing.TYPE_CHECKING:
     import multipart #type:ignore
@@ -40,6 +43,12 @@ class MultipartPart:
     item_headers: list[tuple[bytes, bytes]] = field(default_factory=list)
 
 
+class PartEvent(Enum):
+    HEADERS = 1
+    DATA = 2
+    END = 3
+
+
 def _user_safe_decode(src: typing.Union[bytes , bytearray], codec: str) -> str:
     try:
         return src.decode(codec)
@@ -52,11 +61,33 @@ class MultiPartException(Exception):
         self.message = message
 
 
+def _multipart_options(headers: Headers, content_type: typing.Optional[ContentType]) -> tuple[str, bytes]:
+    if content_type is None:
+        content_type = ContentType.parse(headers.get("Content-Type"))
+    if content_type.boundary is None:
+        raise MultiPartException("Missing boundary in multipart.")
+    return content_type.charset or "utf-8", content_type.boundary
+
+
 class FormParser:
-    def __init__(self, headers: Headers, stream: typing.AsyncGenerator[bytes, None]) -> None:
+    max_part_size = 1024 * 1024  # 1MB
+
+    def __init__(
+        self,
+        headers: Headers,
+        stream: typing.AsyncGenerator[bytes, None],
+        *,
+        max_fields: typing.Union[int , float] = 1000,
+        max_part_size: typing.Optional[int] = None,
+        content_type: typing.Optional[ContentType] = None,
+    ) -> None:
         assert multipart is not None, "The `python-multipart` library must be installed to use form parsing."
         self.headers = headers
         self.stream = stream
+        self.max_fields = max_fields
+        self.content_type = content_type or ContentType.parse(headers.get("Content-Type"))
+        if max_part_size is not None:
+            self.max_part_size = max_part_size
         self.messages: list[tuple[FormMessage, bytes]] = []
 
     def on_field_start(self) -> None:
@@ -95,6 +126,11 @@ class FormParser:
         field_value = b""
 
         items: list[tuple[str, typing.Union[str , UploadedFile]]] = []
+        charset = self.content_type.charset or "utf-8"
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = "utf-8"
 
         # Feed the parser with data from the request.
         async for chunk in self.stream:
@@ -108,13 +144,17 @@ class FormParser:
                 if message_type == FormMessage.FIELD_START:
                     field_name = b""
                     field_value = b""
+                    if len(items) >= self.max_fields:
+                        raise RequestEntityTooLarge(f"Too many fields. Maximum number of fields is {self.max_fields}.")
                 elif message_type == FormMessage.FIELD_NAME:
                     field_name += message_bytes
                 elif message_type == FormMessage.FIELD_DATA:
                     field_value += message_bytes
+                    if len(field_value) > self.max_part_size:
+                        raise RequestEntityTooLarge(f"Field exceeded maximum size of {int(self.max_part_size / 1024)}KB.")
                 elif message_type == FormMessage.FIELD_END:
-                    name = unquote_plus(field_name.decode("latin-1"))
-                    value = unquote_plus(field_value.decode("latin-1"))
+                    name = unquote_plus(field_name.decode("latin-1"), encoding=charset)
+                    value = unquote_plus(field_value.decode("latin-1"), encoding=charset)
                     items.append((name, value))
 
         return FormData(items)
@@ -131,12 +171,17 @@ class MultiPartParser:
         *,
         max_files: typing.Union[int , float] = 1000,
         max_fields:  typing.Union[int , float] = 1000,
+        max_part_size: typing.Optional[int] = None,
+        content_type: typing.Optional[ContentType] = None,
     ) -> None:
         assert multipart is not None, "The `python-multipart` library must be installed to use form parsing."
         self.headers = headers
         self.stream = stream
+        self.content_type = content_type
         self.max_files = max_files
         self.max_fields = max_fields
+        if max_part_size is not None:
+            self.max_part_size = max_part_size
         self.items: list[tuple[str, typing.Union[str , UploadedFile]]] = []
         self._current_files = 0
         self._current_fields = 0
@@ -155,7 +200,7 @@ class MultiPartParser:
         message_bytes = data[start:end]
         if self._current_part.file is None:
             if len(self._current_part.data) + len(message_bytes) > self.max_part_size:
-                raise MultiPartException(f"Part exceeded maximum size of {int(self.max_part_size / 1024)}KB.")
+                raise RequestEntityTooLarge(f"Part exceeded maximum size of {int(self.max_part_size / 1024)}KB.")
             self._current_part.data.extend(message_bytes)
         else:
             self._file_parts_to_write.append((self._current_part, message_bytes))
@@ -198,7 +243,7 @@ class MultiPartParser:
         if b"filename" in options:
             self._current_files += 1
             if self._current_files > self.max_files:
-                raise MultiPartException(f"Too many files. Maximum number of files is {self.max_files}.")
+                raise RequestEntityTooLarge(f"Too many files. Maximum number of files is {self.max_files}.")
             filename = _user_safe_decode(options[b"filename"], self._charset) #type:ignore
             tempfile = SpooledTemporaryFile(max_size=self.max_file_size)
             self._files_to_close_on_error.append(tempfile)
@@ -212,23 +257,15 @@ class MultiPartParser:
         else:
             self._current_fields += 1
             if self._current_fields > self.max_fields:
-                raise MultiPartException(f"Too many fields. Maximum number of fields is {self.max_fields}.")
+                raise RequestEntityTooLarge(f"Too many fields. Maximum number of fields is {self.max_fields}.")
             self._current_part.file = None
 
     def on_end(self) -> None:
         pass
 
     async def parse(self) -> FormData:
-        # Parse the Content-Type header to get the multipart boundary.
-        _, params = parse_options_header(self.headers["Content-Type"]) #type:ignore
-        charset = params.get(b"charset", "utf-8") #type:ignore
-        if isinstance(charset, bytes):
-            charset = charset.decode("latin-1")
-        self._charset = charset #type:ignore
-        try:
-            boundary = params[b"boundary"] #type:ignore
-        except KeyError:
-            raise MultiPartException("Missing boundary in multipart.")
+        # Get the multipart boundary from the parsed Content-Type header.
+        self._charset, boundary = _multipart_options(self.headers, self.content_type)
 
         # Callbacks dictionary.
         callbacks: MultipartCallbacks = { #type:ignore
@@ -261,7 +298,7 @@ class MultiPartParser:
                     await part.file.seek(0)
                 self._file_parts_to_write.clear()
                 self._file_parts_to_finish.clear()
-        except MultiPartException as exc:
+        except (MultiPartException, RequestEntityTooLarge) as exc:
             # Close all the files if there was an error.
             for file in self._files_to_close_on_error:
                 file.close()
@@ -269,3 +306,208 @@ class MultiPartParser:
 
         parser.finalize() #type:ignore
         return FormData(self.items)
+
+
+class MultipartStreamPart:
+    """
+    A single part of a multipart body, yielded by `MultiPartStreamer.iter_parts`
+    as soon as its headers are parsed and before any of its body is read.
+
+    The body must be consumed (via `stream()` or `read()`) before moving on to the
+    next part; any unread data is discarded when the iterator advances.
+    """
+
+    def __init__(
+        self,
+        streamer: "MultiPartStreamer",
+        name: str,
+        filename: typing.Optional[str],
+        headers: Headers,
+    ) -> None:
+        self.name = name
+        self.filename = filename
+        self.headers = headers
+        self._streamer = streamer
+        self._started = False
+        self._finished = False
+
+    @property
+    def content_type(self) -> typing.Optional[str]:
+        return self.headers.get("content-type", None)
+
+    @property
+    def is_file(self) -> bool:
+        return self.filename is not None
+
+    async def stream(self) -> typing.AsyncGenerator[bytes, None]:
+        if self._started:
+            raise RuntimeError("Part body has already been consumed.")
+        self._started = True
+        async for chunk in self._streamer._read_part(self):
+            yield chunk
+
+    async def read(self) -> bytes:
+        chunks: list[bytes] = []
+        async for chunk in self.stream():
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def text(self) -> str:
+        return _user_safe_decode(await self.read(), self._streamer._charset)
+
+    async def _drain(self) -> None:
+        if not self._started:
+            self._started = True
+        async for _ in self._streamer._read_part(self):
+            pass
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"name={self.name!r}, "
+            f"filename={self.filename!r}, "
+            f"headers={self.headers!r})"
+        )
+
+
+class MultiPartStreamer:
+    """
+    Incremental counterpart of `MultiPartParser`: instead of collecting every
+    part into a `FormData`, parts are yielded one by one while the request
+    body is still being received, so uploads can be piped to their
+    destination without being spooled to a temporary file first.
+    """
+
+    def __init__(
+        self,
+        headers: Headers,
+        stream: typing.AsyncGenerator[bytes, None],
+        *,
+        max_files: typing.Union[int , float] = 1000,
+        max_fields:  typing.Union[int , float] = 1000,
+        content_type: typing.Optional[ContentType] = None,
+    ) -> None:
+        assert multipart is not None, "The `python-multipart` library must be installed to use form parsing."
+        self.headers = headers
+        self.stream = stream
+        self.content_type = content_type
+        self.max_files = max_files
+        self.max_fields = max_fields
+        self._current_files = 0
+        self._current_fields = 0
+        self._current_partial_header_name: bytes = b""
+        self._current_partial_header_value: bytes = b""
+        self._content_disposition: typing.Optional[bytes] = None
+        self._item_headers: list[tuple[bytes, bytes]] = []
+        self._charset = "utf-8"
+        self._events: typing.Deque[tuple[PartEvent, typing.Any]] = deque()
+        self._stream_exhausted = False
+        self._body_finished = False
+        self._parser: typing.Any = None
+
+    def on_part_begin(self) -> None:
+        self._content_disposition = None
+        self._item_headers = []
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self._events.append((PartEvent.DATA, data[start:end]))
+
+    def on_part_end(self) -> None:
+        self._events.append((PartEvent.END, None))
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._current_partial_header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._current_partial_header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        field = self._current_partial_header_name.lower()
+        if field == b"content-disposition":
+            self._content_disposition = self._current_partial_header_value
+        self._item_headers.append((field, self._current_partial_header_value))
+        self._current_partial_header_name = b""
+        self._current_partial_header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._content_disposition) #type:ignore
+        try:
+            name = _user_safe_decode(options[b"name"], self._charset) #type:ignore
+        except KeyError:
+            raise MultiPartException('The Content-Disposition header field "name" must be provided.')
+        filename: typing.Optional[str] = None
+        if b"filename" in options:
+            self._current_files += 1
+            if self._current_files > self.max_files:
+                raise RequestEntityTooLarge(f"Too many files. Maximum number of files is {self.max_files}.")
+            filename = _user_safe_decode(options[b"filename"], self._charset) #type:ignore
+        else:
+            self._current_fields += 1
+            if self._current_fields > self.max_fields:
+                raise RequestEntityTooLarge(f"Too many fields. Maximum number of fields is {self.max_fields}.")
+        part = MultipartStreamPart(self, name, filename, Headers(raw=self._item_headers))
+        self._events.append((PartEvent.HEADERS, part))
+
+    def on_end(self) -> None:
+        self._body_finished = True
+
+    async def _next_event(self) -> typing.Optional[tuple[PartEvent, typing.Any]]:
+        while not self._events:
+            if self._stream_exhausted:
+                return None
+            try:
+                chunk = await self.stream.__anext__()
+            except StopAsyncIteration:
+                self._stream_exhausted = True
+                self._parser.finalize()
+                if not self._body_finished:
+                    raise HTTPException(400, "Unexpected end of multipart body.")
+                continue
+            if chunk:
+                try:
+                    self._parser.write(chunk)
+                except (MultiPartException, ValueError) as exc:
+                    # python-multipart's parse errors are ValueErrors.
+                    raise HTTPException(400, str(exc))
+        return self._events.popleft()
+
+    async def _read_part(self, part: MultipartStreamPart) -> typing.AsyncGenerator[bytes, None]:
+        while not part._finished:
+            event = await self._next_event()
+            if event is None:
+                raise HTTPException(400, "Unexpected end of multipart body.")
+            message_type, payload = event
+            if message_type == PartEvent.DATA:
+                yield payload
+            elif message_type == PartEvent.END:
+                part._finished = True
+
+    async def iter_parts(self) -> typing.AsyncGenerator[MultipartStreamPart, None]:
+        try:
+            self._charset, boundary = _multipart_options(self.headers, self.content_type)
+        except MultiPartException as exc:
+            raise HTTPException(400, str(exc))
+
+        callbacks: MultipartCallbacks = { #type:ignore
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_end": self.on_end,
+        }
+        self._parser = multipart.MultipartParser(boundary, callbacks) #type:ignore
+
+        while True:
+            event = await self._next_event()
+            if event is None:
+                break
+            message_type, payload = event
+            if message_type == PartEvent.HEADERS:
+                yield payload
+                # Skip whatever the handler did not read so the next part's
+                # headers can be reached.
+                if not payload._finished:
+                    await payload._drain()
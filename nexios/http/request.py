@@ -1,20 +1,19 @@
 from __future__ import annotations
 
+import codecs
 import json
 import typing
-from http import cookies as http_cookies
+import zlib
 
 import anyio #type:ignore
 
 from nexios._utils.async_helpers import AwaitableOrContextManager, AwaitableOrContextManagerWrapper
-from nexios.structs import URL, Address, FormData, Headers, QueryParams, State
-from .formparsers import FormParser, MultiPartException, MultiPartParser
+from nexios.config import get_config
+from nexios.exceptions import HTTPException, RequestEntityTooLarge
+from nexios.structs import URL, Address, ContentType, FormData, Headers, QueryParams, State
+from .cookies_parser import RequestCookies, parse_cookies
+from .formparsers import FormParser, MultiPartException, MultiPartParser, MultiPartStreamer, MultipartStreamPart
 
-try:
-    from multipart.multipart import parse_options_header  #type:ignore
-
-except ImportError:
-    parse_options_header =  None
 Scope = typing.MutableMapping[str, typing.Any]
 Message = typing.MutableMapping[str, typing.Any]
 
@@ -35,27 +34,93 @@ def cookie_parser(cookie_string: str) -> dict[str, str]:
     """
     This function parses a ``Cookie`` HTTP header into a dict of key/value pairs.
 
-    It attempts to mimic browser cookie parsing behavior: browsers and web servers
-    frequently disregard the spec (RFC 6265) when setting and reading cookies,
-    so we attempt to suit the common scenarios here.
+    Kept for backwards compatibility; `Request.cookies` uses the lazy
+    `RequestCookies` mapping instead.
+    """
+    return parse_cookies(cookie_string)
+
+
+def _config_limit(name: str) -> typing.Any:
+    """Read an optional request limit from the application config, if one is set."""
+    try:
+        return getattr(get_config(), name)
+    except RuntimeError:
+        return None
+
 
-    This function has been adapted from Django 3.1.0.
-    Note: we are explicitly _NOT_ using `SimpleCookie.load` because it is based
-    on an outdated spec and will fail on lots of input we want to support
+def _form_limit(value: typing.Union[int, float, None], name: str) -> typing.Union[int, float]:
+    """Resolve a form limit from the call, then the config, defaulting to 1000."""
+    if value is None:
+        value = _config_limit(name)
+    return 1000 if value is None else value
+
+
+class BodyDecoder:
     """
-    cookie_dict: dict[str, str] = {}
-    for chunk in cookie_string.split(";"):
-        if "=" in chunk:
-            key, val = chunk.split("=", 1)
-        else:
-            # Assume an empty name per
-            # https://bugzilla.mozilla.org/show_bug.cgi?id=169091
-            key, val = "", chunk
-        key, val = key.strip(), val.strip()
-        if key or val:
-            # unquote using Python's algorithm.
-            cookie_dict[key] = http_cookies._unquote(val) #type:ignore
-    return cookie_dict
+    Incrementally decodes a ``Content-Encoding: gzip`` or ``deflate`` request
+    body, refusing to inflate past `max_size` bytes or past `max_ratio` times
+    the compressed size (once `ratio_threshold` bytes have been produced).
+    """
+
+    output_chunk_size = 64 * 1024
+    ratio_threshold = 1024 * 1024
+
+    def __init__(self, encoding: str, max_size: typing.Optional[int] = None, max_ratio: typing.Optional[float] = 100) -> None:
+        self.encoding = encoding
+        self.max_size = max_size
+        self.max_ratio = max_ratio
+        self.compressed_size = 0
+        self.decompressed_size = 0
+        wbits = 16 + zlib.MAX_WBITS if encoding in ("gzip", "x-gzip") else zlib.MAX_WBITS
+        self._decompressor = zlib.decompressobj(wbits)
+        self._first_chunk = True
+
+    def _account(self, data: bytes) -> bytes:
+        self.decompressed_size += len(data)
+        if self.max_size is not None and self.decompressed_size > self.max_size:
+            raise RequestEntityTooLarge(f"Decompressed request body exceeds the limit of {self.max_size} bytes.")
+        if (
+            self.max_ratio is not None
+            and self.decompressed_size > self.ratio_threshold
+            and self.decompressed_size > self.compressed_size * self.max_ratio
+        ):
+            raise RequestEntityTooLarge("Compressed request body expands beyond the allowed ratio.")
+        return data
+
+    def decode(self, chunk: bytes) -> typing.Iterator[bytes]:
+        self.compressed_size += len(chunk)
+        data = chunk
+        while data:
+            try:
+                output = self._decompressor.decompress(data, self.output_chunk_size)
+            except zlib.error:
+                if self._first_chunk and self.encoding == "deflate":
+                    # Some clients send raw deflate streams without the zlib wrapper.
+                    self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    self._first_chunk = False
+                    continue
+                raise HTTPException(400, "Invalid compressed request body.")
+            self._first_chunk = False
+            if output:
+                yield self._account(output)
+            if not self._decompressor.eof:
+                data = self._decompressor.unconsumed_tail
+                continue
+            data = self._decompressor.unused_data
+            if data:
+                if self.encoding not in ("gzip", "x-gzip"):
+                    raise HTTPException(400, "Unexpected data after compressed request body.")
+                # A gzip body may hold several members back to back.
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def flush(self) -> bytes:
+        try:
+            data = self._account(self._decompressor.flush())
+        except zlib.error:
+            raise HTTPException(400, "Invalid compressed request body.")
+        if self.compressed_size and not self._decompressor.eof:
+            raise HTTPException(400, "Truncated compressed request body.")
+        return data
 
 
 class ClientDisconnect(Exception):
@@ -128,15 +193,15 @@ class HTTPConnection(object):
         return self.scope.get("route_params", {})
 
     @property
-    def cookies(self) -> dict[str, str]:
-        if not hasattr(self, "_cookies"):
-            cookies: dict[str, str] = {}
-            cookie_header = self.headers.get("cookie")
-
-            if cookie_header:
-                cookies = cookie_parser(cookie_header)
-            self._cookies = cookies
-        return self._cookies
+    def cookies(self) -> typing.Mapping[str, str]:
+        """
+        The request's cookies. The `Cookie` header is parsed lazily and the
+        result is cached on the scope, so session, CSRF and auth middlewares
+        all share one parse.
+        """
+        if "parsed_cookies" not in self.scope:
+            self.scope["parsed_cookies"] = RequestCookies(self.headers.get("cookie"))
+        return self.scope["parsed_cookies"]
 
     @property
     def client(self) -> typing.Union[Address,None ]:
@@ -222,12 +287,107 @@ class Request(HTTPConnection):
     def receive(self):
         return self._receive
     @property
+    def parsed_content_type(self) -> ContentType:
+        """
+        The parsed `Content-Type` header. It is parsed once per request and
+        cached on the scope, so every middleware's view of the request and
+        the form parsers share the same result.
+        """
+        if "parsed_content_type" not in self.scope:
+            self.scope["parsed_content_type"] = ContentType.parse(self.headers.get("Content-Type"))
+        return self.scope["parsed_content_type"]
+
+    @property
     def content_type(self) -> typing.Optional[str]:
-        content_type_header = self.headers.get("Content-Type")
-        content_type: str
-        content_type, _ = parse_options_header(content_type_header) #type:ignore
-        return content_type #type:ignore
+        return self.parsed_content_type.media_type or None
+
+    @property
+    def charset(self) -> str:
+        """
+        The charset declared in `Content-Type`, falling back to utf-8 when it
+        is missing or unknown.
+        """
+        charset = self.parsed_content_type.charset
+        if charset:
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                pass
+        return "utf-8"
+
+    @property
+    def max_body_size(self) -> typing.Optional[int]:
+        """
+        The maximum number of body bytes accepted for this request: the
+        route's `max_body_size` if it sets one, else the app-wide
+        `max_body_size` config value. `None` means unlimited.
+        """
+        if "max_body_size" in self.scope:
+            return self.scope["max_body_size"]
+        return _config_limit("max_body_size")
+
+    def _check_content_length(self, limit: typing.Optional[int]) -> None:
+        if limit is None:
+            return
+        content_length = self.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            raise RequestEntityTooLarge(f"Request body exceeds the limit of {limit} bytes.")
+
+    def _get_body_decoder(self) -> typing.Optional[BodyDecoder]:
+        """
+        Return a decoder for the request's `Content-Encoding` when the
+        `decompress_requests` config option is enabled, or `None` if the
+        body should be passed through as received.
+        """
+        encoding = self.headers.get("content-encoding")
+        if not encoding or self.scope.get("body_decoded") or not _config_limit("decompress_requests"):
+            return None
+        encoding = encoding.strip().lower()
+        if encoding == "identity":
+            return None
+        if encoding not in ("gzip", "x-gzip", "deflate"):
+            raise HTTPException(415, f"Unsupported Content-Encoding: {encoding}")
+        max_size = _config_limit("max_decompressed_size")
+        max_ratio = _config_limit("max_decompression_ratio")
+        return BodyDecoder(
+            encoding,
+            max_size=max_size if max_size is not None else self.max_body_size,
+            max_ratio=max_ratio if max_ratio is not None else 100,
+        )
+
     async def stream(self) -> typing.AsyncGenerator[bytes, None]:
+        if hasattr(self, "_body"):
+            yield self._body
+            yield b""
+            return
+        limit = self.max_body_size
+        decoder = self._get_body_decoder()
+        if limit is None and decoder is None:
+            async for chunk in self._receive_stream():
+                yield chunk
+            return
+        self._check_content_length(limit)
+        received = 0
+        async for chunk in self._receive_stream():
+            received += len(chunk)
+            if limit is not None and received > limit:
+                raise RequestEntityTooLarge(f"Request body exceeds the limit of {limit} bytes.")
+            if decoder is None:
+                yield chunk
+            elif chunk:
+                for decoded in decoder.decode(chunk):
+                    yield decoded
+        if decoder is not None:
+            tail = decoder.flush()
+            if tail:
+                yield tail
+            yield b""
+
+    async def _receive_stream(self) -> typing.AsyncGenerator[bytes, None]:
+        """
+        The request body exactly as received, without any limits applied.
+        Used by `stream()` and when proxying the body to downstream apps.
+        """
         if hasattr(self, "_body"):
             yield self._body
             yield b""
@@ -253,6 +413,9 @@ class Request(HTTPConnection):
             async for chunk in self.stream():
                 chunks.append(chunk)
             self._body = b"".join(chunks)
+            if self.headers.get("content-encoding") and _config_limit("decompress_requests"):
+                # Downstream apps receive the cached body, which is already decoded.
+                self.scope["body_decoded"] = True
         return self._body
 
     @property
@@ -261,7 +424,7 @@ class Request(HTTPConnection):
         if not hasattr(self, "_json"):
             _body = await self.body()
             try:
-                body = _body.decode()
+                body = _body.decode(self.charset)
             except UnicodeDecodeError:
                 return {}
             try:
@@ -270,34 +433,70 @@ class Request(HTTPConnection):
                 self._json = {}
         return self._json
 
-    async def _get_form(self, *, max_files: typing.Union[int,float] = 1000, max_fields: typing.Union[int , float] = 1000) -> FormData:
+    async def _get_form(
+        self,
+        *,
+        max_files: typing.Union[int , float , None] = None,
+        max_fields: typing.Union[int , float , None] = None,
+    ) -> FormData:
         if self._form is None:
-            assert (
-                parse_options_header is not None
-            ), "The `python-multipart` library must be installed to use form parsing."
-            content_type_header = self.headers.get("Content-Type")
-            content_type: bytes
-            content_type, _ = parse_options_header(content_type_header) #type:ignore
-            if content_type == b"multipart/form-data":
+            max_files = _form_limit(max_files, "max_form_files")
+            max_fields = _form_limit(max_fields, "max_form_fields")
+            max_part_size = _config_limit("max_form_part_size")
+            content_type = self.parsed_content_type
+            if content_type.media_type == "multipart/form-data":
                 try:
                     multipart_parser = MultiPartParser(
                         self.headers,
                         self.stream(),
                         max_files=max_files,
                         max_fields=max_fields,
+                        max_part_size=max_part_size,
+                        content_type=content_type,
                     )
                     self._form = await multipart_parser.parse()
                 except MultiPartException as _:
                     self._form = {}  #type: ignore
-            elif content_type == b"application/x-www-form-urlencoded":
-                form_parser = FormParser(self.headers, self.stream())
+            elif content_type.media_type == "application/x-www-form-urlencoded":
+                form_parser = FormParser(
+                    self.headers,
+                    self.stream(),
+                    max_fields=max_fields,
+                    max_part_size=max_part_size,
+                    content_type=content_type,
+                )
                 self._form = await form_parser.parse()
             else:
                 self._form :FormData = FormData()
         return self._form #type:ignore
+    def iter_parts(
+        self,
+        *,
+        max_files: typing.Union[int , float , None] = None,
+        max_fields: typing.Union[int , float , None] = None,
+    ) -> typing.AsyncGenerator[MultipartStreamPart, None]:
+        """
+        Iterate over the parts of a `multipart/form-data` body as they arrive.
+
+        Each part exposes its headers, field name and filename, and an async
+        `stream()` of its body, so large uploads can be written straight to
+        their destination instead of being collected into `form_data` first.
+        """
+        content_type = self.parsed_content_type
+        if content_type.media_type != "multipart/form-data":
+            raise HTTPException(400, "Request body is not multipart/form-data.")
+        streamer = MultiPartStreamer(
+            self.headers,
+            self.stream(),
+            max_files=_form_limit(max_files, "max_form_files"),
+            max_fields=_form_limit(max_fields, "max_form_fields"),
+            content_type=content_type,
+        )
+        return streamer.iter_parts()
+
     @property
     def form_data(
-        self, *, max_files: typing.Union[int , float] = 1000, max_fields: typing.Union[int , float] = 1000
+        self, *, max_files: typing.Union[int , float , None] = None, max_fields: typing.Union[int , float , None] = None
     ) -> AwaitableOrContextManager[FormData]:
         return AwaitableOrContextManagerWrapper(self._get_form(max_files=max_files, max_fields=max_fields))
 
@@ -352,7 +551,7 @@ class Request(HTTPConnection):
         """
 
         body = await self.body()
-        return body.decode()
+        return body.decode(self.charset)
 
     def valid(self) -> bool:
         """
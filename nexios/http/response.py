@@ -3,8 +3,6 @@ from email.utils import formatdate
 from typing import Any, Dict, List, Optional, Tuple, Union, Generator
 from pathlib import Path
 import json
-from base64 import b64encode
-from hashlib import sha1
 import mimetypes
 import typing
 import os
@@ -12,15 +10,18 @@ import anyio
 from typing import AsyncIterator
 from anyio import AsyncFile
 import http.cookies
-from email.utils import format_datetime, formatdate
+from email.utils import format_datetime, formatdate, parsedate_to_datetime
 from datetime import datetime, timezone
 from urllib.parse import quote
 import hashlib
 import anyio.to_thread
-from nexios.structs import MutableHeaders
-from nexios.http.request import ClientDisconnect
+from nexios.structs import Headers, MutableHeaders, ResponseHeaders
+from nexios.http.request import ClientDisconnect, Request
+from nexios._utils.async_helpers import collapse_excgroups
 import stat
+import mmap
 from functools import partial
+from itertools import islice
 Scope = typing.MutableMapping[str, typing.Any]
 Message = typing.MutableMapping[str, typing.Any]
 
@@ -38,6 +39,53 @@ class RangeNotSatisfiable(Exception):
     def __init__(self, max_size: int) -> None:
         self.max_size = max_size
 
+def etag_matches(header_value: str, etag: str, weak: bool = True) -> bool:
+    """
+    Whether `etag` is one of the entity tags in an `If-None-Match` or
+    `If-Range` header value. Weak comparison ignores the `W/` prefix;
+    strong comparison never matches a weak tag.
+    """
+    if header_value.strip() == "*":
+        return True
+    if not weak and etag.startswith("W/"):
+        return False
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header_value.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == opaque_tag:
+            return True
+    return False
+
+
+def make_etag(data: Union[bytes, memoryview], weak: bool = True) -> str:
+    """Build an ETag from a 128-bit BLAKE2b digest of `data`."""
+    tag = f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+
+def is_not_modified(request_headers: Headers, etag: Optional[str], last_modified: Optional[float]) -> bool:
+    """
+    Evaluate `If-None-Match` and `If-Modified-Since` against a resource's
+    validators. `If-Modified-Since` is only considered when the request has
+    no `If-None-Match`, as RFC 9110 requires.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        return etag is not None and etag_matches(if_none_match, etag)
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
 class BaseResponse:
     """
     Base ASGI-compatible Response class with support for cookies, caching, and custom headers.
@@ -56,6 +104,8 @@ class BaseResponse:
         404: "Not Found",
         500: "Internal Server Error",
     }
+    _frozen = False
+    _auto_etag = False
 
     def __init__(
         self,
@@ -66,7 +116,7 @@ class BaseResponse:
     ):
         self.charset = "utf-8"
         self.status_code: int = status_code
-        self._headers: List[Tuple[bytes,bytes]] = []
+        self._header_store = ResponseHeaders()
         self._body = self.render(body)
         self.headers = headers or {}
         
@@ -80,26 +130,43 @@ class BaseResponse:
             return content # type: ignore
         return content.encode(self.charset) # type: ignore
 
+    @property
+    def _headers(self) -> List[Tuple[bytes, bytes]]:
+        return self._header_store.raw
+
+    @_headers.setter
+    def _headers(self, value: typing.Iterable[Tuple[bytes, bytes]]) -> None:
+        self._header_store.set_raw(list(value))
+
+    def _adopt_headers(self, headers: ResponseHeaders) -> None:
+        """
+        Make `headers` this response's header store, keeping any headers this
+        response had already set. Used to carry headers across body-type
+        switches without copying them.
+        """
+        if headers is self._header_store:
+            return
+        for key, value in self._header_store.raw:
+            headers.add_raw(key, value, replace=key != b"set-cookie")
+        self._header_store = headers
+
     def _init_headers(self):
-        raw_headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in self.headers.items()]
-        keys = [h[0] for h in raw_headers]
-        populate_content_length = b"content-length" not in keys
-        populate_content_type = b"content-type" not in keys
+        store = self._header_store
+        for key, value in self.headers.items():
+            key_bytes = key.lower().encode("latin-1")
+            store.add_raw(key_bytes, value.encode("latin-1"), replace=key_bytes != b"set-cookie")
         body = getattr(self, "_body", None)
         if (
             body is not None
-            and populate_content_length
+            and b"content-length" not in store._index
             and not (self.status_code < 200 or self.status_code in (204, 304))
         ):
-            content_length = str(len(body))
-            self.header("content-length",content_length,overide=True)
+            store.add_raw(b"content-length", str(len(body)).encode("latin-1"))
         content_type :typing.Optional[str]  = self.content_type
-        if content_type is not None and populate_content_type:
+        if content_type is not None and b"content-type" not in store._index:
             if content_type.startswith("text/") and "charset=" not in content_type.lower():
                 content_type += "; charset=" + self.charset
-            self._headers.append((b"content-type", content_type.encode("latin-1")))
-        
-        self._headers.extend(raw_headers)
+            store.add_raw(b"content-type", content_type.encode("latin-1"))
         
     def set_cookie(
         self,
@@ -166,23 +233,56 @@ class BaseResponse:
             cache_control.append("public")
             
         cache_control.append(f"max-age={max_age}")
-        self.headers["cache-control"] = ", ".join(cache_control)
+        self.header("cache-control", ", ".join(cache_control), overide=True)
         
-        etag = self._generate_etag()
-        self.headers["etag"] = etag
+        # The ETag is computed from the final body when the response is sent.
+        self._auto_etag = True
         
         expires = datetime.utcnow() + timedelta(seconds=max_age)  # type: ignore
-        self.headers["expires"] = formatdate(expires.timestamp(), usegmt=True)
+        self.header("expires", formatdate(expires.timestamp(), usegmt=True), overide=True)
 
     def disable_caching(self) -> None:
         """Disable caching for this response."""
-        self.headers["cache-control"] = "no-store, no-cache, must-revalidate, max-age=0"
-        self.headers["pragma"] = "no-cache"
-        self.headers["expires"] = "0"
+        self.header("cache-control", "no-store, no-cache, must-revalidate, max-age=0", overide=True)
+        self.header("pragma", "no-cache", overide=True)
+        self.header("expires", "0", overide=True)
+        self._auto_etag = False
+
+    def _is_not_modified(self, scope: Scope) -> bool:
+        """Whether the request's `If-None-Match` matches this response's ETag."""
+        if self.status_code != 200 or scope.get("method", "GET") not in ("GET", "HEAD"):
+            return False
+        etag = self._header_store.get("etag")
+        if etag is None:
+            return False
+        return is_not_modified(Headers(raw=list(scope.get("headers") or [])), etag, None)
+
+    def _not_modified_headers(self) -> List[Tuple[bytes, bytes]]:
+        return [
+            (key, value) for key, value in self._headers
+            if key not in (b"content-length", b"content-type", b"content-disposition")
+        ]
+
+    async def _send_not_modified(self, send: Send) -> None:
+        """Send a 304 carrying the validators and caching headers but no body."""
+        await send({
+            'type': 'http.response.start',
+            'status': 304,
+            'headers': self._not_modified_headers(),
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'',
+        })
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Make the response callable as an ASGI application."""
         self._init_headers()
+        if self._auto_etag and "etag" not in self._header_store:
+            self.header("etag", self._generate_etag())
+        if self._is_not_modified(scope):
+            await self._send_not_modified(send)
+            return
         
         await send({
             'type': 'http.response.start',
@@ -211,22 +311,14 @@ class BaseResponse:
     
     def _generate_etag(self) -> str:
         """Generate an ETag for the response content."""
-        content_hash = sha1()
-        content_hash.update(self._body) #type:ignore
-        return f'W/"{b64encode(content_hash.digest()).decode("utf-8")}"'
+        return make_etag(self._body)
     
     def header(self, key: str, value: str, overide: bool = False) -> "BaseResponse":
         """
         Set a response header. If `overide` is True, replace the existing header.
         """
         key_bytes = key.lower().encode("latin-1")  # Normalize key to lowercase for case-insensitive comparison
-        value_bytes = value.encode("latin-1")
-        new_header = (key_bytes, value_bytes)
-
-        if overide:
-            self._headers = [(k, v) for k, v in self._headers if k != key_bytes]
-        
-        self._headers.append(new_header)
+        self._header_store.add_raw(key_bytes, value.encode("latin-1"), replace=overide)
         return self
     
  
@@ -297,6 +389,8 @@ class FileResponse(BaseResponse):
     support for range requests, and multipart responses.
     """
     chunk_size = 64 * 1024  # 64KB chunks
+    max_chunk_size = 1024 * 1024  # chunks double up to 1MB
+    mmap_threshold: Optional[int] = 8 * 1024 * 1024  # files this large are memory-mapped; None disables
 
     def __init__(
         self,
@@ -305,35 +399,49 @@ class FileResponse(BaseResponse):
         status_code: int = 200,
         headers: Optional[Dict[str, str]] = None,
         content_disposition_type: str = "inline",
+        content_type: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
     ):
         super().__init__(headers=headers)
         self.path = Path(path)
+        # A known stat result (e.g. from a static file manifest) saves the os.stat call.
+        self.stat_result = stat_result
         self.filename = filename or self.path.name
         self.content_disposition_type = content_disposition_type
         self.status_code = status_code
 
         self.headers = headers or {}
-        content_type, _ = mimetypes.guess_type(str(self.path))
+        if content_type is None:
+            content_type, _ = mimetypes.guess_type(str(self.path))
         self.header('content-type', content_type or 'application/octet-stream')
         self.header('content-disposition' ,f'{content_disposition_type}; filename="{self.filename}"')
         self.header('accept-ranges','bytes')         
 
         self._ranges: List[Tuple[int, int]] = []
         self._multipart_boundary: Optional[str] = None
+        self._view: Optional[memoryview] = None
+    @staticmethod
+    def stat_etag(stat_result: os.stat_result) -> str:
+        """The ETag of a file, derived from its modification time and size."""
+        etag_base = str(stat_result.st_mtime) + "-" + str(stat_result.st_size)
+        return f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+
     def set_stat_headers(self, stat_result: os.stat_result) -> None:
         content_length = str(stat_result.st_size)
         last_modified = formatdate(stat_result.st_mtime, usegmt=True)
-        etag_base = str(stat_result.st_mtime) + "-" + str(stat_result.st_size)
-        etag = f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+        etag = self.stat_etag(stat_result)
 
         self.header("content-length", content_length, overide=True)
-        self.headers.setdefault("last-modified", last_modified)
-        self.headers.setdefault("etag", etag)
+        if "last-modified" not in self._header_store:
+            self.header("last-modified", last_modified)
+        if "etag" not in self._header_store:
+            self.header("etag", etag)
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle the ASGI response, including range requests."""
         
         try:
-            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            stat_result = self.stat_result or await anyio.to_thread.run_sync(os.stat, self.path)
+            self._file_size = stat_result.st_size
             self.set_stat_headers(stat_result)
         except FileNotFoundError:
             raise RuntimeError(f"File at path {self.path} does not exist.")
@@ -343,52 +451,112 @@ class FileResponse(BaseResponse):
                 raise RuntimeError(f"File at path {self.path} is not a file.")
         
         
-        range_header = MutableHeaders(scope=scope).get("Range")
-        if range_header:
+        request_headers = Headers(scope=scope)
+        if scope.get("method", "GET") in ("GET", "HEAD") and is_not_modified(
+            request_headers, self._header_store.get("etag"), stat_result.st_mtime
+        ):
+            await self._send_not_modified(send)
+            return
+
+        range_header = request_headers.get("range")
+        if range_header and self._if_range_matches(request_headers.get("if-range")):
             self._handle_range_header(range_header)
 
         await self._send_response(scope, receive, send)
+
+    def _if_range_matches(self, if_range: Optional[str]) -> bool:
+        """
+        A range is only honoured if `If-Range` is absent or still describes
+        the file: a strong match of its ETag, or an exact match of its
+        Last-Modified date. Otherwise the whole file is sent.
+        """
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            etag = self._header_store.get("etag")
+            return etag is not None and etag_matches(if_range, etag, weak=False)
+        return if_range == self._header_store.get("last-modified")
+
   
 
     def _handle_range_header(self, range_header: str) -> None:
         """Parse and validate the Range header."""
-        file_size = self.path.stat().st_size
+        file_size = self._file_size
         
         try:
-            unit, ranges = range_header.strip().split('=')
-            if unit != 'bytes':
+            unit, _, ranges = range_header.strip().partition('=')
+            if unit.strip().lower() != 'bytes':
                 raise ValueError("Only byte ranges are supported")
 
-            self._ranges = []
+            parsed: List[Tuple[int, int]] = []
             for range_str in ranges.split(','):
-                range = range_str.split('-')
-                start :int = int(range[0])
-                end :int =int(range[-1]) if range[-1] != "" else 0
-                start = int(start) if start else 0
-                end :int = int(end) if end else file_size - 1
-
-                if start < 0 or end >= file_size or start > end:
+                start_str, _, end_str = range_str.strip().partition('-')
+                if not start_str:
+                    # Suffix range: the last N bytes of the file.
+                    suffix_length = int(end_str)
+                    if suffix_length <= 0:
+                        raise ValueError("Invalid range")
+                    start, end = max(file_size - suffix_length, 0), file_size - 1
+                else:
+                    start = int(start_str)
+                    end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+
+                if start < 0 or start > end:
                     raise ValueError("Invalid range")
 
-                self._ranges.append((start, end))
+                parsed.append((start, end))
 
+            self._ranges = self._coalesce_ranges(parsed)
             if len(self._ranges) == 1:
                 start, end = self._ranges[0]
                 content_length = end - start + 1
                 self.header('content-range', f'bytes {start}-{end}/{file_size}')
                 self.header('content-length', str(content_length),overide=True)
                 self.status_code = 206
-            elif len(self._ranges) > 1:
-                
-                self._multipart_boundary = self._generate_multipart_boundary()
-                self.header('content-type',f'multipart/byteranges; boundary={self._multipart_boundary}')
+            else:
+                self._prepare_multipart()
                 self.status_code = 206  
 
         except ValueError as _: 
          
+            self._ranges = []
             self.header('content-range',f'bytes */{file_size}')
+            self.header('content-length', '0', overide=True)
             self.status_code = 416  
 
+    @staticmethod
+    def _coalesce_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Merge overlapping and adjacent ranges, in file order."""
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _prepare_multipart(self) -> None:
+        """Build the part headers of a `multipart/byteranges` body and its length."""
+        self._multipart_boundary = self._generate_multipart_boundary()
+        part_type = self._header_store.get("content-type")
+        self._part_headers: List[bytes] = []
+        for start, end in self._ranges:
+            part_header = (
+                f'--{self._multipart_boundary}\r\n'
+                f'Content-Type: {part_type}\r\n'
+                f'Content-Range: bytes {start}-{end}/{self._file_size}\r\n\r\n'
+            ).encode('latin-1')
+            # Every part after the first starts on a new line.
+            self._part_headers.append(part_header if not self._part_headers else b'\r\n' + part_header)
+        self._multipart_end = f'\r\n--{self._multipart_boundary}--\r\n'.encode('latin-1')
+        content_length = len(self._multipart_end) + sum(
+            len(part_header) + end - start + 1
+            for part_header, (start, end) in zip(self._part_headers, self._ranges)
+        )
+        self.header('content-type',f'multipart/byteranges; boundary={self._multipart_boundary}', overide=True)
+        self.header('content-length', str(content_length), overide=True)
+
     async def _send_response(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Send the file response, handling range requests and multipart responses."""
        
@@ -405,109 +573,131 @@ class FileResponse(BaseResponse):
             })
             return
 
+        zerocopy = "http.response.zerocopy" in (scope.get("extensions") or {})
+        use_mmap = (
+            not zerocopy
+            and self.mmap_threshold is not None
+            and self._file_size >= max(self.mmap_threshold, 1)
+        )
         async with await anyio.open_file(self.path, 'rb') as file:
-            
-            if self._multipart_boundary:
-                for start, end in self._ranges:
-                    await self._send_multipart_chunk(file, start, end, send)
+            mapped: Optional[mmap.mmap] = None
+            if use_mmap:
+                mapped = mmap.mmap(file.wrapped.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(mapped)
+            try:
+                if self._multipart_boundary:
+                    for part_header, (start, end) in zip(self._part_headers, self._ranges):
+                        await send({
+                            'type': 'http.response.body',
+                            'body': part_header,
+                            'more_body': True,
+                        })
+                        await self._send_segment(file, start, end - start + 1, send, zerocopy)
+                    await send({
+                        'type': 'http.response.body',
+                        'body': self._multipart_end,
+                        'more_body': False,
+                    })
+                elif self._ranges:
+                    start, end = self._ranges[0]
+                    await self._send_segment(file, start, end - start + 1, send, zerocopy, more_body=False)
+                else:
+                    await self._send_segment(file, 0, self._file_size, send, zerocopy, more_body=False)
+            finally:
+                if mapped is not None:
+                    self._view = None
+                    try:
+                        mapped.close()
+                    except BufferError:
+                        # A slice is still referenced downstream; the mapping
+                        # is released once it is garbage collected.
+                        pass
+
+    async def _send_segment(
+        self, file: AsyncFile[bytes], offset: int, count: int, send: Send, zerocopy: bool, more_body: bool = True
+    ) -> None:
+        """
+        Send `count` bytes of the file starting at `offset`. With the
+        `http.response.zerocopy` extension the server copies the bytes itself
+        (e.g. with `os.sendfile`). Files of at least `mmap_threshold` bytes
+        are memory-mapped and sent as `memoryview` slices. Otherwise the
+        file is read in chunks that grow from `chunk_size` to
+        `max_chunk_size`, so large files take few thread hops.
+        """
+        if zerocopy:
+            await send({
+                'type': 'http.response.zerocopy',
+                'file': file.wrapped,
+                'offset': offset,
+                'count': count,
+                'more_body': more_body,
+            })
+            return
+        if self._view is not None:
+            stop = offset + count
+            for position in range(offset, stop, self.max_chunk_size):
                 await send({
                     'type': 'http.response.body',
-                    'body': f'--{self._multipart_boundary}--\r\n'.encode('utf-8'),
-                    'more_body': False,
+                    'body': self._view[position:min(position + self.max_chunk_size, stop)],
+                    'more_body': True,
                 })
-            elif self._ranges:
-                start, end = self._ranges[0]
-                await self._send_range(file, start, end, send) #type:ignore
-            else:
-                await self._send_full_file(file, send) #type:ignore
-
-    async def _send_full_file(self, file: AsyncIterator[bytes], send: Send) -> None:
-        """Send the entire file in chunks using AnyIO."""
-        while True:
-            chunk = await file.read(self.chunk_size) #type:ignore
-            if not chunk:
-                break
-            await send({
-                'type': 'http.response.body',
-                'body': chunk,
-                'more_body': True,
-            })
-        await send({
-            'type': 'http.response.body',
-            'body': b'',
-            'more_body': False,
-        })
-
-    async def _send_range(self, file: AsyncFile[bytes], start: int, end: int, send: Send) -> None:
-        """Send a single range of the file using AnyIO."""
-        await file.seek(start)
-        remaining = end - start + 1
-        self.header('content-length',str(remaining), overide=True)
-        
-        while remaining > 0:
-            chunk_size = min(self.chunk_size, remaining)
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
-            await send({
-                'type': 'http.response.body',
-                'body': chunk,
-                'more_body': True,
-            })
-            remaining -= len(chunk)
-        await send({
-            'type': 'http.response.body',
-            'body': b'',
-            'more_body': False,
-            
-        })
-
-    async def _send_multipart_chunk(self, file: AsyncFile[bytes], start: int, end: int, send: Send) -> None:
-        """Send a multipart chunk for a range using AnyIO."""
-        await file.seek(start)
-        remaining = end - start + 1
-
-        boundary = f'--{self._multipart_boundary}\r\n'
-        header = next((value for key, value in self._headers if key == b"content-type"), None)
-        headers = f'Content-Type: {header}\r\nContent-Range: bytes {start}-{end}/{self.path.stat().st_size}\r\n\r\n' #type:ignore[str-bytes-safe]
-        await send({
-            'type': 'http.response.body',
-            'body': (boundary + headers).encode('utf-8'),
-            'more_body': True,
-        })
-
-        while remaining > 0:
-            chunk_size = min(self.chunk_size, remaining)
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
+        else:
+            await file.seek(offset)
+            remaining = count
+            chunk_size = self.chunk_size
+            while remaining > 0:
+                chunk = await file.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+                remaining -= len(chunk)
+                chunk_size = min(chunk_size * 2, self.max_chunk_size)
+        if not more_body:
             await send({
                 'type': 'http.response.body',
-                'body': chunk,
-                'more_body': True,
+                'body': b'',
+                'more_body': False,
             })
-            remaining -= len(chunk)
 
     def _generate_multipart_boundary(self) -> str:
         """Generate a unique multipart boundary string."""
         return f"boundary_{os.urandom(16).hex()}"
 
 
+FLUSH: Any = object()
+"""Yield this from a streamed body to send everything buffered so far immediately."""
+
+
 class StreamingResponse(BaseResponse):
     """
     Response subclass for streaming content.
+
+    By default every yielded chunk is sent as its own message. With
+    `buffer_size` set, chunks are coalesced until that many bytes are
+    buffered; with `max_latency` set, buffered bytes are also sent once they
+    have waited that many seconds. Yielding `FLUSH` sends the buffer at once.
     """
+    default_buffer_size = 16 * 1024
+
     def __init__(
         self,
         content: AsyncIterator[Union[str, bytes]],
         status_code: int = 200,
         headers: Optional[Dict[str, str]] = None,
         content_type: str = "text/plain",
+        buffer_size: Optional[int] = None,
+        max_latency: Optional[float] = None,
     ):
         super().__init__(headers=headers)
         
         self.content_iterator = content
         self.status_code = status_code
+        self.buffer_size = buffer_size
+        self.max_latency = max_latency
         self._cookies: List[Tuple[str, str, Dict[str, Any]]] = []
         
         self.content_type = content_type
@@ -529,12 +719,82 @@ class StreamingResponse(BaseResponse):
                 "headers": self.raw_headers,
             }
         )
-        async for chunk in self.content_iterator:
-            if not isinstance(chunk, (bytes, memoryview)):
-                chunk = chunk.encode(self.charset)   #type:ignore
-            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        if self.buffer_size is None and self.max_latency is None:
+            async for chunk in self.content_iterator:
+                if chunk is FLUSH:
+                    continue
+                await send({"type": "http.response.body", "body": self._encode_chunk(chunk), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        with collapse_excgroups():
+            await self._stream_coalesced(send)
+
+    def _encode_chunk(self, chunk: Union[str, bytes, memoryview]) -> Union[bytes, memoryview]:
+        if not isinstance(chunk, (bytes, memoryview)):
+            return chunk.encode(self.charset)   #type:ignore
+        return chunk
+
+    async def _stream_coalesced(self, send: Send) -> None:
+        limit = self.buffer_size or self.default_buffer_size
+        buffer = bytearray()
+        deadline: Optional[float] = None
+
+        async def flush(more_body: bool = True) -> None:
+            nonlocal deadline
+            deadline = None
+            if buffer or not more_body:
+                body = bytes(buffer)
+                buffer.clear()
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        async def add(chunk: Any) -> None:
+            nonlocal deadline
+            if chunk is FLUSH:
+                await flush()
+                return
+            buffer.extend(self._encode_chunk(chunk))
+            if len(buffer) >= limit:
+                await flush()
+            elif buffer and deadline is None and self.max_latency is not None:
+                deadline = anyio.current_time() + self.max_latency
+
+        if self.max_latency is None:
+            async for chunk in self.content_iterator:
+                await add(chunk)
+            await flush(more_body=False)
+            return
 
-        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        # Read the body in a separate task, so buffered bytes can be sent when
+        # `max_latency` runs out even while the iterator is still waiting.
+        send_stream, receive_stream = anyio.create_memory_object_stream(16)  # type: ignore
+        producer_exc: Optional[BaseException] = None
+
+        async def produce() -> None:
+            nonlocal producer_exc
+            async with send_stream:
+                try:
+                    async for chunk in self.content_iterator:
+                        await send_stream.send(chunk)
+                except Exception as exc:
+                    producer_exc = exc
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(produce)
+            async with receive_stream:
+                while True:
+                    timeout = None if deadline is None else max(deadline - anyio.current_time(), 0)
+                    with anyio.move_on_after(timeout) as cancel_scope:
+                        try:
+                            chunk = await receive_stream.receive()
+                        except anyio.EndOfStream:
+                            break
+                    if cancel_scope.cancelled_caught:
+                        await flush()
+                    else:
+                        await add(chunk)
+        if producer_exc is not None:
+            raise producer_exc
+        await flush(more_body=False)
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         spec_version = tuple(map(int, scope.get("asgi", {}).get("spec_version", "2.0").split(".")))
@@ -554,6 +814,113 @@ class StreamingResponse(BaseResponse):
                 task_group.start_soon(wrap, partial(self.stream_response, send))
                 await wrap(partial(self.listen_for_disconnect, receive))
 
+async def _iterate_rows(
+    rows: Union[typing.AsyncIterable[Any], typing.Iterable[Any]], batch_size: int, in_threadpool: bool = False
+) -> typing.AsyncGenerator[Any, None]:
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:  # type: ignore
+            yield row
+    elif not in_threadpool or isinstance(rows, typing.Collection):
+        # Sync iterables stay on the event loop by default: many cursors
+        # (e.g. sqlite3) may only be used from the thread that created them.
+        for row in rows:
+            yield row
+    else:
+        # Opted in: pull the rows off the event loop, a batch per thread hop.
+        iterator = iter(rows)
+        while True:
+            batch = await anyio.to_thread.run_sync(list, islice(iterator, batch_size))
+            for row in batch:
+                yield row
+            if len(batch) < batch_size:
+                break
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    Streams rows from a sync or async iterable as newline-delimited JSON,
+    serializing one row at a time. Sync iterables are read on the event
+    loop; with `iterate_in_threadpool`, lazy ones (blocking cursors that are
+    safe to use from any thread) are read in a worker thread instead,
+    `row_batch_size` rows at a time.
+    """
+    media_type = "application/x-ndjson"
+    row_batch_size = 256
+
+    def __init__(
+        self,
+        rows: Union[typing.AsyncIterable[Any], typing.Iterable[Any]],
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        ensure_ascii: bool = True,
+        buffer_size: Optional[int] = StreamingResponse.default_buffer_size,
+        max_latency: Optional[float] = None,
+        iterate_in_threadpool: bool = False,
+    ):
+        self.iterate_in_threadpool = iterate_in_threadpool
+        self._encoder = json.JSONEncoder(ensure_ascii=ensure_ascii, allow_nan=False, default=str, separators=(",", ":"))
+        super().__init__(
+            self._render(rows),  # type: ignore
+            status_code=status_code,
+            headers=headers,
+            content_type=self.media_type,
+            buffer_size=buffer_size,
+            max_latency=max_latency,
+        )
+        self.header("content-type", self.media_type, overide=True)
+
+    def _encode_row(self, row: Any) -> bytes:
+        return self._encoder.encode(row).encode("utf-8")
+
+    async def _render(self, rows: Union[typing.AsyncIterable[Any], typing.Iterable[Any]]) -> typing.AsyncGenerator[bytes, None]:
+        async for row in _iterate_rows(rows, self.row_batch_size, self.iterate_in_threadpool):
+            yield self._encode_row(row) + b"\n"
+
+
+class StreamingJSONResponse(NDJSONResponse):
+    """
+    Streams rows from a sync or async iterable as a JSON array, serializing
+    one row at a time. With `envelope`, the array is wrapped in an object
+    under `key` and the envelope's other fields follow it, e.g.
+    `{"items":[...],"pagination":{...}}`.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        rows: Union[typing.AsyncIterable[Any], typing.Iterable[Any]],
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        envelope: Optional[Dict[str, Any]] = None,
+        key: str = "items",
+        ensure_ascii: bool = True,
+        buffer_size: Optional[int] = StreamingResponse.default_buffer_size,
+        max_latency: Optional[float] = None,
+        iterate_in_threadpool: bool = False,
+    ):
+        self.envelope = envelope
+        self.key = key
+        super().__init__(rows, status_code, headers, ensure_ascii, buffer_size, max_latency, iterate_in_threadpool)
+
+    async def _render(self, rows: Union[typing.AsyncIterable[Any], typing.Iterable[Any]]) -> typing.AsyncGenerator[bytes, None]:
+        if self.envelope is not None:
+            yield b"{" + self._encode_row(self.key) + b":["
+        else:
+            yield b"["
+        separator = b""
+        async for row in _iterate_rows(rows, self.row_batch_size, self.iterate_in_threadpool):
+            yield separator + self._encode_row(row)
+            separator = b","
+        if self.envelope is None:
+            yield b"]"
+            return
+        tail = b"]"
+        for name, value in self.envelope.items():
+            if name != self.key:
+                tail += b"," + self._encode_row(name) + b":" + self._encode_row(value)
+        yield tail + b"}"
+
+
 class RedirectResponse(BaseResponse):
     """
     Response subclass for HTTP redirects.
@@ -562,11 +929,12 @@ class RedirectResponse(BaseResponse):
         self,
         url: str,
         status_code: int = 302,
-        headers: Dict[str, str] = {},
+        headers: Optional[Dict[str, str]] = None,
     ):
         if not 300 <= status_code < 400:
             raise ValueError("Status code must be a valid redirect status")
             
+        headers = dict(headers or {})
         headers["location"] = quote(str(url), safe=":/%#?=@[]!$&'()*+,;")
         
         super().__init__(
@@ -576,24 +944,92 @@ class RedirectResponse(BaseResponse):
         )
 
 
+class PreencodedResponse(BaseResponse):
+    """
+    A constant response whose status, header bytes and body bytes are
+    computed once, when it is defined, and sent on every request with two
+    `send` calls and no per-request encoding.
+
+    Use it for fixed payloads such as health checks and acks::
+
+        OK = PreencodedResponse.from_response(JSONResponse({"ok": True}))
+
+        @app.get("/health")
+        async def health(req, res):
+            return res.make_response(OK)
+
+    Setting headers or cookies on `res` afterwards works on a private copy,
+    so the shared response is never modified.
+    """
+    _frozen = True
+
+    def __init__(
+        self,
+        body: Union[JSONType, Any] = "",
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+    ):
+        super().__init__(body, status_code, headers, content_type)
+        self._freeze()
+
+    @classmethod
+    def from_response(cls, response: BaseResponse) -> "PreencodedResponse":
+        """Freeze a buffered response, such as a `JSONResponse` or `RedirectResponse`."""
+        if isinstance(response, (StreamingResponse, FileResponse)):
+            raise ValueError("Only buffered responses can be preencoded")
+        response._init_headers()
+        frozen = cls(response.body, response.status_code)
+        frozen.content_type = response.content_type
+        frozen._headers = response.raw_headers
+        frozen._freeze()
+        return frozen
+
+    def _freeze(self) -> None:
+        self._init_headers()
+        self.headers = {}
+        self._start_message: Message = {
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": tuple(self._headers),
+        }
+        self._body_message: Message = {"type": "http.response.body", "body": self._body}
+
+    def thaw(self) -> BaseResponse:
+        """Return a mutable copy of this response."""
+        response = BaseResponse(self._body, self.status_code)
+        response._headers = [item for item in self._start_message["headers"] if item[0] != b"content-length"]
+        response.content_type = self.content_type
+        return response
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(self._start_message)
+        await send(self._body_message)
+
+
 class NexiosResponse:
-    
-    _instance = None
+    """
+    The response object handed to handlers and middlewares, one per request.
+    """
 
-    def __new__(cls, *args, **kwargs): #type:ignore
-        if cls._instance is None:
-            cls._instance = super(NexiosResponse, cls).__new__(cls)
-            cls._instance._initialized = False #type:ignore
-        return cls._instance
     def __init__(self):
         self._response: BaseResponse = BaseResponse()
         self._cookies: List[Dict[str, Any]] = []
         self._status_code = self._response.status_code
-       
 
     @property
-    def headers(self):
-        return MutableHeaders({k.decode("utf-8"): v.decode("utf-8") for k, v in self._response._headers}) #type:ignore
+    def headers(self) -> ResponseHeaders:
+        """
+        The response headers. This is a live view: headers set through it are
+        sent with the response.
+        """
+        return self._mutable_response._header_store
+
+    @property
+    def _mutable_response(self) -> BaseResponse:
+        if self._response._frozen:
+            self._response = self._response.thaw()  # type: ignore
+        return self._response
     
     
     @property
@@ -601,7 +1037,7 @@ class NexiosResponse:
         return self._cookies #type:ignore
     def remove_header(self, key: str) -> "NexiosResponse":
         """Remove a header from the response."""
-        self._response._headers = [(k, v) for k, v in self._response._headers if k.decode("latin-1").lower() != key.lower()] #type:ignore
+        del self.headers[key]
         return self
     @property
     def body(self):
@@ -625,13 +1061,13 @@ class NexiosResponse:
     
     def _preserve_headers_and_cookies(self, new_response: BaseResponse) -> BaseResponse:
         """Preserve headers and cookies when switching to a new response."""
-        for key, value in self.headers.items():
-            new_response.header(key, value, overide=True)       
-
+        if not self._response._frozen:
+            new_response._adopt_headers(self._response._header_store)
+            new_response._auto_etag = new_response._auto_etag or self._response._auto_etag
         return new_response
     def has_header(self, key: str) -> bool:
         """Check if a header is present in the response."""
-        return key.lower() in (k.lower() for k in self.headers.keys())
+        return key in self.headers
     def text(self, content: JSONType, status_code: int = 200, headers: Dict[str, Any] = {}):
         """Send plain text or HTML content."""
         new_response = PlainTextResponse(body=content, status_code=status_code, headers=headers)
@@ -670,7 +1106,14 @@ class NexiosResponse:
         self._response = self._preserve_headers_and_cookies(new_response)
         return self
 
-    def file(self, path: str, filename: Optional[str] = None, content_disposition_type: str = "inline"):
+    def file(
+        self,
+        path: str,
+        filename: Optional[str] = None,
+        content_disposition_type: str = "inline",
+        content_type: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ):
         """Send file response."""
         new_response = FileResponse(
             path=path,
@@ -678,17 +1121,73 @@ class NexiosResponse:
             status_code=self._status_code,
             headers=self._response.headers,
             content_disposition_type=content_disposition_type,
+            content_type=content_type,
+            stat_result=stat_result,
         )
         self._response = self._preserve_headers_and_cookies(new_response)
         return self
 
-    def stream(self, iterator: Generator[Union[str, bytes], Any, Any], content_type: str = "text/plain",status_code :Optional[int] = None):
+    def stream(
+        self,
+        iterator: Generator[Union[str, bytes], Any, Any],
+        content_type: str = "text/plain",
+        status_code :Optional[int] = None,
+        buffer_size: Optional[int] = None,
+        max_latency: Optional[float] = None,
+    ):
         """Send streaming response."""
         new_response = StreamingResponse(
             content=iterator,  # type: ignore
             status_code=status_code or self._status_code,
             headers=self._response.headers,
-            content_type=content_type
+            content_type=content_type,
+            buffer_size=buffer_size,
+            max_latency=max_latency,
+        )
+        self._response = self._preserve_headers_and_cookies(new_response)
+        return self
+
+    def ndjson(self, rows: Any, status_code: int = 200, **kwargs: Any):
+        """Stream rows from a sync or async iterable as newline-delimited JSON."""
+        new_response = NDJSONResponse(rows, status_code=status_code, **kwargs)
+        self._response = self._preserve_headers_and_cookies(new_response)
+        return self
+
+    def json_stream(
+        self,
+        rows: Any,
+        status_code: int = 200,
+        envelope: Optional[Dict[str, Any]] = None,
+        key: str = "items",
+        **kwargs: Any,
+    ):
+        """
+        Stream rows from a sync or async iterable as a JSON array, or as
+        `key` of an `envelope` object, without building the list in memory.
+        """
+        new_response = StreamingJSONResponse(rows, status_code=status_code, envelope=envelope, key=key, **kwargs)
+        self._response = self._preserve_headers_and_cookies(new_response)
+        return self
+
+    def sse(
+        self,
+        content: Any,
+        status_code: int = 200,
+        retry: Optional[int] = None,
+        heartbeat: Any = ...,
+    ):
+        """
+        Send a Server-Sent Events stream. `content` is an async iterable of
+        events, or a callable taking the client's `Last-Event-ID`. See
+        `nexios.http.sse.EventSourceResponse`.
+        """
+        from nexios.http.sse import EventSourceResponse, default_heartbeat
+
+        new_response = EventSourceResponse(
+            content,
+            status_code=status_code,
+            retry=retry,
+            heartbeat=default_heartbeat if heartbeat is ... else heartbeat,
         )
         self._response = self._preserve_headers_and_cookies(new_response)
         return self
@@ -705,14 +1204,14 @@ class NexiosResponse:
 
     def status(self, status_code: int):
         """Set response status code."""
-        self._response.status_code = status_code
+        self._mutable_response.status_code = status_code
         return self
 
     def header(self, key: str, value: str, overide:bool = False):
         """Set a response header."""
         
             
-        self._response.header(key, value,overide=overide)
+        self._mutable_response.header(key, value,overide=overide)
         return self
 
     def set_cookie(
@@ -728,7 +1227,7 @@ class NexiosResponse:
         samesite: typing.Optional[typing.Literal["lax", "strict", "none"]]  = "lax",
     ):
         """Set a response cookie."""
-        self._response.set_cookie(
+        self._mutable_response.set_cookie(
             key=key,
             value=value,
             max_age=max_age,
@@ -748,7 +1247,7 @@ class NexiosResponse:
         domain: Optional[str] = None,
     ):
         """Delete a response cookie."""
-        self._response.delete_cookie(
+        self._mutable_response.delete_cookie(
             key=key,
             path=path,
             domain=domain,
@@ -759,12 +1258,37 @@ class NexiosResponse:
 
     def cache(self, max_age: int = 3600, private: bool = True):
         """Enable response caching."""
-        self._response.enable_caching(max_age, private)
+        self._mutable_response.enable_caching(max_age, private)
         return self
 
+    def check_etag(self, request: Request, key: Union[str, bytes], weak: bool = True) -> bool:
+        """
+        Tag the response with an ETag derived from `key`, a version string
+        for the resource (e.g. an id plus an updated-at timestamp), and
+        return True if the request already holds that version. In that case
+        the response has become an empty 304 and the handler can return it
+        without building the body:
+
+            if res.check_etag(req, f"{post.id}:{post.updated_at}"):
+                return res
+            return res.json(serialize(post))
+
+        This works for streamed responses too, since the body never has to
+        be hashed.
+        """
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        etag = make_etag(key, weak=weak)
+        self.header("etag", etag, overide=True)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and request.method in ("GET", "HEAD") and etag_matches(if_none_match, etag):
+            self.empty(status_code=304)
+            return True
+        return False
+
     def no_cache(self):
         """Disable response caching."""
-        self._response.disable_caching()
+        self._mutable_response.disable_caching()
         return self
 
     def resp(
@@ -794,8 +1318,8 @@ class NexiosResponse:
     
     def set_headers(self, headers: Dict[str, str], overide_all :bool = False):
         if overide_all:
-            self._response._headers =  [(bytes(str(k), 'utf-8'), bytes(str(v), 'utf-8')) for k, v in d.items()] #type:ignore
-            return
+            self._mutable_response._headers =  [(str(k).lower().encode("latin-1"), str(v).encode("latin-1")) for k, v in headers.items()]
+            return self
         """Set multiple headers at once."""
         for key, value in headers.items():
             self.header(key, value)
@@ -803,7 +1327,7 @@ class NexiosResponse:
 
     
     def set_body(self, new_body :Any):
-        self._response._body = new_body #type:ignore
+        self._mutable_response._body = new_body #type:ignore
     def get_response(self) -> BaseResponse:
         """Make the response ASGI-compatible."""
         return self._response
@@ -827,6 +1351,12 @@ class NexiosResponse:
             NexiosResponse: The current instance for method chaining.
         """
         
+        if response_class._frozen:
+            if not self._response._frozen and self._response._header_store.raw:
+                response_class = response_class.thaw()  # type: ignore
+            else:
+                self._response = response_class
+                return self
         self._response = self._preserve_headers_and_cookies(response_class)
         return self
     def __str__(self):
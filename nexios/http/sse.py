@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import typing
+
+import anyio
+from anyio.streams.memory import MemoryObjectSendStream
+
+from nexios._utils.async_helpers import collapse_excgroups
+from nexios.structs import Headers
+from .response import Receive, Scope, Send, StreamingResponse
+
+HEARTBEAT = b": ping\n\n"
+
+EventContent = typing.Union["ServerSentEvent", typing.Mapping[str, typing.Any], str, bytes]
+EventSource = typing.Union[
+    typing.AsyncIterable[EventContent],
+    typing.Callable[[typing.Optional[str]], typing.AsyncIterable[EventContent]],
+]
+
+
+def _field_value(name: str, value: str) -> bytes:
+    # A line break would end the field and let the rest of the value be read
+    # as fields of its own.
+    if "\r" in value or "\n" in value or "\0" in value:
+        raise ValueError(f"SSE {name} must not contain CR, LF or NUL characters.")
+    return value.encode("utf-8")
+
+
+class ServerSentEvent:
+    """
+    A single event of a `text/event-stream` response.
+
+    `data` is sent as one `data:` line per line of text; anything that is not
+    a string or bytes is JSON encoded first.
+    """
+
+    __slots__ = ("data", "event", "id", "retry", "comment")
+
+    def __init__(
+        self,
+        data: typing.Any = None,
+        event: typing.Optional[str] = None,
+        id: typing.Optional[typing.Union[str, int]] = None,
+        retry: typing.Optional[int] = None,
+        comment: typing.Optional[str] = None,
+    ) -> None:
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+        self.comment = comment
+
+    def encode(self) -> bytes:
+        lines: typing.List[bytes] = []
+        if self.comment is not None:
+            # bytes.splitlines() splits on exactly CRLF, CR and LF, the line
+            # endings of the event stream format.
+            lines.extend(b": " + line for line in self.comment.encode("utf-8").splitlines())
+        if self.id is not None:
+            lines.append(b"id: " + _field_value("id", str(self.id)))
+        if self.event is not None:
+            lines.append(b"event: " + _field_value("event", self.event))
+        if self.retry is not None:
+            lines.append(b"retry: " + str(int(self.retry)).encode("ascii"))
+        if self.data is not None:
+            data = self.data
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            elif not isinstance(data, bytes):
+                data = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            lines.extend(b"data: " + line for line in (data.splitlines() or [b""]))
+        lines.append(b"\n")
+        return b"\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(data={self.data!r}, event={self.event!r}, id={self.id!r})"
+
+
+def encode_event(item: EventContent) -> bytes:
+    if isinstance(item, ServerSentEvent):
+        return item.encode()
+    if isinstance(item, typing.Mapping):
+        return ServerSentEvent(**item).encode()
+    return ServerSentEvent(data=item).encode()
+
+
+class HeartbeatScheduler:
+    """
+    Sends a keepalive comment to every open event stream from a single
+    timer, so idle connections cost no task or timer of their own.
+    """
+
+    def __init__(self, interval: float = 15.0) -> None:
+        self.interval = interval
+        self._streams: typing.Set[MemoryObjectSendStream[bytes]] = set()
+        self._handle: typing.Optional[asyncio.TimerHandle] = None
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+
+    def register(self, stream: MemoryObjectSendStream[bytes]) -> None:
+        self._streams.add(stream)
+        loop = asyncio.get_running_loop()
+        if self._handle is None or self._loop is not loop:
+            if self._handle is not None:
+                self._handle.cancel()
+            self._loop = loop
+            self._handle = loop.call_later(self.interval, self._tick)
+
+    def unregister(self, stream: MemoryObjectSendStream[bytes]) -> None:
+        self._streams.discard(stream)
+        if not self._streams and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _tick(self) -> None:
+        for stream in list(self._streams):
+            try:
+                stream.send_nowait(HEARTBEAT)
+            except anyio.WouldBlock:
+                # Events are already queued for this client, which keeps it alive.
+                pass
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                self._streams.discard(stream)
+        if self._streams and self._loop is not None:
+            self._handle = self._loop.call_later(self.interval, self._tick)
+        else:
+            self._handle = None
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+
+default_heartbeat = HeartbeatScheduler()
+
+
+class EventSourceResponse(StreamingResponse):
+    """
+    A `text/event-stream` response.
+
+    `content` yields `ServerSentEvent`s, mappings of their fields, or plain
+    data. It may also be a callable that receives the client's
+    `Last-Event-ID` header (or `None`) and returns the iterable, so a
+    reconnecting client can resume where it left off.
+
+    Keepalive comments come from `heartbeat`, a `HeartbeatScheduler` shared
+    by all open streams; pass `None` to disable them.
+    """
+
+    max_queued_events = 32
+
+    def __init__(
+        self,
+        content: EventSource,
+        status_code: int = 200,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        retry: typing.Optional[int] = None,
+        heartbeat: typing.Optional[HeartbeatScheduler] = default_heartbeat,
+    ):
+        super().__init__(content, status_code, headers, content_type="text/event-stream")  # type: ignore
+        self.retry = retry
+        self.heartbeat = heartbeat
+        self.header("content-type", "text/event-stream; charset=utf-8", overide=True)
+        self.header("cache-control", "no-cache", overide=True)
+        self.header("x-accel-buffering", "no", overide=True)
+
+    def _resolve_content(self, scope: Scope) -> typing.AsyncIterable[EventContent]:
+        content = self.content_iterator
+        if callable(content) and not hasattr(content, "__aiter__"):
+            last_event_id = Headers(raw=list(scope.get("headers") or [])).get("last-event-id")
+            return content(last_event_id)  # type: ignore
+        return content  # type: ignore
+
+    async def _produce(
+        self, content: typing.AsyncIterable[EventContent], stream: MemoryObjectSendStream[bytes]
+    ) -> None:
+        with stream:
+            if self.retry is not None:
+                await stream.send(ServerSentEvent(retry=self.retry).encode())
+            async for item in content:
+                await stream.send(encode_event(item))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        content = self._resolve_content(scope)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        send_stream, receive_stream = anyio.create_memory_object_stream(self.max_queued_events)  # type: ignore
+        if self.heartbeat is not None:
+            self.heartbeat.register(send_stream)
+        try:
+            with collapse_excgroups():
+                async with anyio.create_task_group() as task_group:
+
+                    async def wrap(func: typing.Callable[[], typing.Awaitable[None]]) -> None:
+                        await func()
+                        task_group.cancel_scope.cancel()
+
+                    task_group.start_soon(wrap, lambda: self.listen_for_disconnect(receive))
+                    task_group.start_soon(self._produce, content, send_stream)
+
+                    async with receive_stream:
+                        async for chunk in receive_stream:
+                            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+                    task_group.cancel_scope.cancel()
+        finally:
+            if self.heartbeat is not None:
+                self.heartbeat.unregister(send_stream)
@@ -0,0 +1,404 @@
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import typing
+from collections import OrderedDict
+from pathlib import Path
+
+import anyio
+import anyio.to_thread
+
+from nexios.http import Request, Response
+from nexios.http.response import BaseResponse, PreencodedResponse
+from nexios.logging import getLogger
+from nexios.middlewares.base import BaseMiddleware
+from nexios.types import Message
+
+logger = getLogger("nexios")
+
+_REVALIDATE_KEY = "nexios.cache.revalidate"
+# Request headers that would turn the background refresh into a 304 or a 206.
+_CONDITIONAL_HEADERS = {b"if-none-match", b"if-modified-since", b"if-range", b"range", b"cache-control"}
+
+
+def parse_cache_control(value: typing.Optional[str]) -> typing.Dict[str, typing.Optional[str]]:
+    """Parse a `Cache-Control` header into a dict of lower-cased directives."""
+    directives: typing.Dict[str, typing.Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: typing.Optional[str]) -> typing.Optional[int]:
+    try:
+        return max(int(value), 0)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+
+class CachedResponse:
+    """
+    A stored response: its status, raw headers and body, when it was stored,
+    until when it is fresh, and until when it may still be served stale.
+    `vary` holds the request header names the response varies on, and
+    `vary_values` the values they had when it was stored.
+
+    For a URL whose responses vary, the entry under its bare key is an
+    empty index record that only names the `vary` headers; each variant is
+    stored once, under a key that includes their values.
+    """
+
+    __slots__ = ("status_code", "headers", "body", "stored_at", "fresh_until", "stale_until", "vary", "vary_values", "_response")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: typing.List[typing.Tuple[bytes, bytes]],
+        body: bytes,
+        stored_at: float,
+        fresh_until: float,
+        stale_until: float,
+        vary: typing.Tuple[str, ...] = (),
+        vary_values: typing.Tuple[str, ...] = (),
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.vary = vary
+        self.vary_values = vary_values
+        self._response: typing.Optional[PreencodedResponse] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers)
+
+    @property
+    def response(self) -> PreencodedResponse:
+        """The stored response, encoded once and replayed on every hit."""
+        if self._response is None:
+            response = BaseResponse(self.body, self.status_code)
+            response._headers = self.headers
+            self._response = PreencodedResponse.from_response(response)
+        return self._response
+
+    def dumps(self) -> bytes:
+        meta = {
+            "status_code": self.status_code,
+            "headers": [[key.decode("latin-1"), value.decode("latin-1")] for key, value in self.headers],
+            "stored_at": self.stored_at,
+            "fresh_until": self.fresh_until,
+            "stale_until": self.stale_until,
+            "vary": list(self.vary),
+            "vary_values": list(self.vary_values),
+        }
+        return json.dumps(meta, separators=(",", ":")).encode("utf-8") + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        meta, _, body = data.partition(b"\n")
+        fields = json.loads(meta)
+        return cls(
+            fields["status_code"],
+            [(key.encode("latin-1"), value.encode("latin-1")) for key, value in fields["headers"]],
+            body,
+            fields["stored_at"],
+            fields["fresh_until"],
+            fields["stale_until"],
+            tuple(fields["vary"]),
+            tuple(fields["vary_values"]),
+        )
+
+
+class CacheStorage(abc.ABC):
+    """
+    Where `HTTPCacheMiddleware` keeps its responses. Subclass it to store
+    them elsewhere, e.g. in Redis.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> typing.Optional[CachedResponse]:
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryCacheStorage(CacheStorage):
+    """Keeps responses in process memory, evicting the least recently used past `max_bytes`."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    async def get(self, key: str) -> typing.Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            return
+        await self.delete(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileCacheStorage(CacheStorage):
+    """
+    Keeps responses as files in `directory`, one per key, so they are
+    shared by every worker on the host and survive restarts.
+    """
+
+    def __init__(self, directory: typing.Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _read(self, path: Path) -> typing.Optional[CachedResponse]:
+        try:
+            return CachedResponse.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError):
+            # A partial or foreign file; treat it as a miss.
+            return None
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    async def get(self, key: str) -> typing.Optional[CachedResponse]:
+        return await anyio.to_thread.run_sync(self._read, self._path(key))
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        await anyio.to_thread.run_sync(self._write, self._path(key), entry.dumps())
+
+    async def delete(self, key: str) -> None:
+        path = self._path(key)
+        await anyio.to_thread.run_sync(lambda: path.unlink() if path.exists() else None)
+
+    async def clear(self) -> None:
+        def remove_all() -> None:
+            for path in self.directory.iterdir():
+                if path.is_file():
+                    path.unlink()
+
+        await anyio.to_thread.run_sync(remove_all)
+
+
+class HTTPCacheMiddleware(BaseMiddleware):
+    """
+    A shared HTTP cache in front of the application, like a caching reverse
+    proxy inside each worker.
+
+    Complete `200` responses to `GET` and `HEAD` requests are stored when
+    their `Cache-Control` allows a shared cache to keep them: `max-age` or
+    `s-maxage` (which wins) sets how long they stay fresh, and `private`,
+    `no-store` or `no-cache` keep them out. Responses are keyed by method and
+    URL, plus the request headers named in their `Vary` header. Streamed
+    responses, responses setting cookies and bodies over `max_entry_size`
+    are never stored.
+
+    A response whose `Cache-Control` carries `stale-while-revalidate=N` (or
+    every response, with `stale_while_revalidate`) is still served for up to
+    N seconds after it expires, while a fresh copy is fetched in the
+    background.
+    """
+
+    def __init__(
+        self,
+        storage: typing.Optional[CacheStorage] = None,
+        *,
+        max_entry_size: int = 1024 * 1024,
+        stale_while_revalidate: typing.Optional[int] = None,
+        methods: typing.Tuple[str, ...] = ("GET", "HEAD"),
+        clock: typing.Callable[[], float] = time.time,
+    ) -> None:
+        self.storage = storage if storage is not None else MemoryCacheStorage()
+        self.max_entry_size = max_entry_size
+        self.stale_while_revalidate = stale_while_revalidate
+        self.methods = methods
+        self.clock = clock
+        self._refreshing: typing.Dict[str, "asyncio.Task[None]"] = {}
+
+    def _key(self, request: Request) -> str:
+        return f"{request.method}:{request.url}"
+
+    @staticmethod
+    def _vary_values(request: Request, vary: typing.Tuple[str, ...]) -> typing.Tuple[str, ...]:
+        return tuple(request.headers.get(name, "") for name in vary)
+
+    @staticmethod
+    def _variant_key(key: str, vary_values: typing.Tuple[str, ...]) -> str:
+        return key + "\0" + "\0".join(vary_values)
+
+    async def _lookup(self, request: Request, key: str) -> typing.Optional[CachedResponse]:
+        entry = await self.storage.get(key)
+        if entry is None or not entry.vary:
+            return entry
+        # The entry under the bare key is an index naming the headers the URL varies on.
+        return await self.storage.get(self._variant_key(key, self._vary_values(request, entry.vary)))
+
+    async def process_request(
+        self,
+        request: Request,
+        response: Response,
+        call_next: typing.Callable[..., typing.Awaitable[typing.Any]],
+    ):
+        if request.method not in self.methods or "range" in request.headers:
+            return await call_next()
+
+        request_directives = parse_cache_control(request.headers.get("cache-control"))
+        if "no-store" in request_directives:
+            return await call_next()
+
+        key = self._key(request)
+        revalidating = request.scope.get(_REVALIDATE_KEY, False)
+        if not revalidating and "no-cache" not in request_directives:
+            entry = await self._lookup(request, key)
+            if entry is not None:
+                now = self.clock()
+                if now < entry.fresh_until:
+                    return self._serve(request, response, entry, now)
+                if now < entry.stale_until:
+                    self._revalidate(request, key)
+                    return self._serve(request, response, entry, now)
+
+        await call_next()
+        await self._store(request, response, key)
+
+    def _serve(self, request: Request, response: Response, entry: CachedResponse, now: float) -> Response:
+        cached = entry.response
+        if cached._is_not_modified(request.scope):
+            not_modified = BaseResponse(status_code=304)
+            not_modified._headers = cached._not_modified_headers()
+            response.make_response(not_modified)
+        else:
+            response.make_response(cached)
+        response.header("age", str(int(max(now - entry.stored_at, 0))), overide=True)
+        return response
+
+    async def _store(self, request: Request, response: Response, key: str) -> None:
+        inner = response.get_response()
+        headers = response.headers
+        if inner.status_code != 200 or "set-cookie" in headers:
+            return
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "private" in directives or "no-store" in directives or "no-cache" in directives:
+            return
+        if "authorization" in request.headers and not ("public" in directives or "s-maxage" in directives):
+            return
+        max_age = _seconds(directives.get("s-maxage")) if "s-maxage" in directives else _seconds(directives.get("max-age"))
+        if not max_age:
+            return
+        vary = tuple(sorted({name.strip().lower() for value in headers.getlist("vary") for name in value.split(",") if name.strip()}))
+        if "*" in vary:
+            return
+        content_length = _seconds(headers.get("content-length"))
+        if content_length is None or content_length > self.max_entry_size:
+            return
+
+        body = await self._read_body(inner)
+        stale = _seconds(directives.get("stale-while-revalidate"))
+        if stale is None:
+            stale = self.stale_while_revalidate or 0
+        now = self.clock()
+        entry = CachedResponse(
+            inner.status_code,
+            list(headers.raw),
+            body,
+            stored_at=now,
+            fresh_until=now + max_age,
+            stale_until=now + max_age + stale,
+            vary=vary,
+            vary_values=self._vary_values(request, vary),
+        )
+        if vary:
+            index = CachedResponse(0, [], b"", now, entry.fresh_until, entry.stale_until, vary=vary)
+            await self.storage.set(self._variant_key(key, entry.vary_values), entry)
+            await self.storage.set(key, index)
+        else:
+            await self.storage.set(key, entry)
+        response.make_response(entry.response)
+
+    @staticmethod
+    async def _read_body(inner: BaseResponse) -> bytes:
+        iterator = getattr(inner, "content_iterator", None)
+        if iterator is None:
+            return bytes(inner.body)
+        chunks: typing.List[bytes] = []
+        async for chunk in iterator:
+            chunks.append(chunk if isinstance(chunk, bytes) else bytes(chunk))
+        return b"".join(chunks)
+
+    def _revalidate(self, request: Request, key: str) -> None:
+        """Re-run the request through the application in the background to refresh `key`."""
+        if key in self._refreshing:
+            return
+        scope = dict(request.scope)
+        scope[_REVALIDATE_KEY] = True
+        scope["headers"] = [item for item in scope["headers"] if item[0] not in _CONDITIONAL_HEADERS]
+        app = request.app
+
+        received = False
+
+        async def receive() -> Message:
+            nonlocal received
+            if received:
+                # Nobody is listening; wait until the response is done with us.
+                await anyio.sleep_forever()
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: Message) -> None:
+            pass
+
+        async def refresh() -> None:
+            try:
+                await app(scope, receive, send)
+            except Exception:
+                logger.exception(f"Background revalidation of {key} failed")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
@@ -16,9 +16,31 @@ class CommonMiddleware(BaseMiddleware):
 
     It prevents caching of sensitive data, ensures proper content handling,
     and restricts browser behaviors that could lead to security vulnerabilities.
+
+    The header block is read from the config and encoded once, when the
+    middleware is created, and appended to each response in one step. Pass
+    `echo_user_agent=True` to also copy the request's `User-Agent` into
+    `X-User-Agent`.
     """
 
-   
+    def __init__(self, echo_user_agent: bool = False) -> None:
+        self.config = get_config()
+        self.echo_user_agent = echo_user_agent
+        headers = [
+            ("X-Frame-Options", "DENY"),
+            ("X-XSS-Protection", "1; mode=block"),
+            ("X-Content-Type-Options", "nosniff"),
+            ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+            ("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0"),
+            ("Pragma", "no-cache"),
+            ("Content-Security-Policy", self.config.content_security_policy),
+            ("Permissions-Policy", self.config.permissions_policy),
+            ("Referrer-Policy", self.config.referrer_policy),
+            ("Feature-Policy", self.config.feature_policy),
+        ]
+        self.headers: typing.Tuple[typing.Tuple[bytes, bytes], ...] = tuple(
+            (key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers if value
+        )
 
     async def process_request(
         self,
@@ -57,8 +79,8 @@ class CommonMiddleware(BaseMiddleware):
         """
         Process the outgoing response and add security headers.
 
-        This method applies security and cache-control headers based on
-        the application's configuration.
+        This method appends the precomputed security and cache-control
+        headers, and the user agent when `echo_user_agent` is set.
 
         Args:
             request (Request): The HTTP request object.
@@ -67,26 +89,7 @@ class CommonMiddleware(BaseMiddleware):
         Returns:
             None
         """
-        self.config = get_config()
-        response.header("X-Frame-Options", "DENY")
-        response.header("X-XSS-Protection", "1; mode=block")
-        response.header("X-Content-Type-Options", "nosniff")
-        response.header("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
-        response.header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
-        response.header("Pragma", "no-cache")
-
-        if self.config.content_security_policy:
-            response.header("Content-Security-Policy", self.config.content_security_policy)
+        response.headers.extend_raw(self.headers)
 
-        if self.config.permissions_policy:
-            response.header("Permissions-Policy",  self.config.permissions_policy)
-
-        if self.config.referrer_policy:
-            response.header("Referrer-Policy", self.config.referrer_policy)
-
-        if self.config.feature_policy:
-            response.header("Feature-Policy", self.config.feature_policy)
-
-        if request.user_agent:
+        if self.echo_user_agent and request.user_agent:
             response.header("X-User-Agent", request.user_agent)
-
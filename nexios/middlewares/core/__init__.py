@@ -67,7 +67,7 @@ class _CachedRequest(Request):
         super().__init__(scope, receive)
         self._wrapped_rcv_disconnected = False
         self._wrapped_rcv_consumed = False
-        self._wrapped_rc_stream = self.stream()
+        self._wrapped_rc_stream = self._receive_stream()
 
     async def wrapped_receive(self) -> Message:
         # wrapped_rcv state 1: disconnected
@@ -118,7 +118,7 @@ class _CachedRequest(Request):
         else:
             # body() was never called and stream() wasn't consumed
             try:
-                stream = self.stream()
+                stream = self._receive_stream()
                 chunk = await stream.__anext__()
                 self._wrapped_rcv_consumed = self._stream_consumed
                 return {
@@ -141,6 +141,14 @@ class BaseMiddleware:
             await self.app(scope, receive, send)
             return
 
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopy" in extensions:
+            # The body is relayed through `body_stream`, which only carries
+            # `http.response.body` messages, so nothing below may use zerocopy.
+            scope["extensions"] = {
+                name: value for name, value in extensions.items() if name != "http.response.zerocopy"
+            }
+
         request = _CachedRequest(scope, receive)
         response = Response()
         
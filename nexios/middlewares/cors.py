@@ -1,9 +1,12 @@
 import re
+from collections import OrderedDict
+from functools import lru_cache
 # from typing_extensions import Annotated, Doc
 from nexios.middlewares.base import BaseMiddleware
 from nexios.http import Request,Response
+from nexios.http.response import JSONResponse, PreencodedResponse
 from nexios.config import get_config
-from typing import Callable, Optional,List,Dict,Any
+from typing import Callable, Optional,List,Dict,Any,Tuple
 import typing
 from nexios.logging import getLogger
 
@@ -15,9 +18,17 @@ BASIC_HEADERS = {"Accept", "Accept-Language", "Content-Language", "Content-Type"
 SAFELISTED_HEADERS = {"accept", "accept-language", "content-language", "content-type"}
 
 class CORSMiddleware(BaseMiddleware):
+    """
+    Applies the `cors` config. The config is compiled once, when the
+    middleware is created: origins, methods and headers become sets, and the
+    constant response headers are encoded in advance. Up to `cache_size`
+    origin decisions (including those of `dynamic_origin_validator`) and
+    built preflight responses are remembered.
+    """
+
     def __init__(self):
         config = get_config().cors
-        
+        self.enabled = bool(config)
         if not config:
             return None
         self.allow_origins :List[str] = config.allow_origins or []
@@ -33,6 +44,7 @@ class CORSMiddleware(BaseMiddleware):
         self.debug = config.debug or False
         self.custom_error_status = config.custom_error_status or 400
         self.custom_error_messages = getattr(config, "custom_error_messages", {}) or {}
+        self.cache_size: int = config.cache_size or 1024
 
         self.simple_headers :Dict[str,Any]= {}
         if self.allow_credentials:
@@ -50,12 +62,29 @@ class CORSMiddleware(BaseMiddleware):
             self.allow_headers :List[str] = [*list(SAFELISTED_HEADERS),*config.allow_headers]
         else:
             self.allow_headers  = list(SAFELISTED_HEADERS)
-            
-  
+
+        # The compiled policy.
+        self._allow_origin_set = frozenset(self.allow_origins)
+        self._blacklist_origin_set = frozenset(self.blacklist_origins)
+        self._allow_all_origins = "*" in self._allow_origin_set
+        self._allow_method_set = frozenset(method.lower() for method in self.allow_methods)
+        self._allow_all_methods = "*" in self._allow_method_set
+        self._allow_header_set = frozenset(header.lower() for header in self.allow_headers)
+        self._blacklist_header_set = frozenset(header.lower() for header in self.blacklist_headers)
+        self._allow_all_headers = "*" in self._allow_header_set
+        self._credentials_header: Tuple[Tuple[bytes, bytes], ...] = (
+            ((b"access-control-allow-credentials", b"true"),) if self.allow_credentials else ()
+        )
+        self._expose_header: Tuple[Tuple[bytes, bytes], ...] = (
+            ((b"access-control-expose-headers", ", ".join(self.expose_headers).encode("latin-1")),)
+            if self.expose_headers else ()
+        )
+        self._origin_allowed = lru_cache(maxsize=self.cache_size)(self._check_origin)
+        self._preflights: "OrderedDict[Tuple[Optional[str], Optional[str], Optional[str]], PreencodedResponse]" = OrderedDict()
+
+
     async def process_request(self, request: Request,response :  Response, call_next :  typing.Callable[..., typing.Awaitable[Any]]):
-        config = get_config().cors
-        
-        if not config:
+        if not self.enabled:
             await call_next()
             return None
 
@@ -68,69 +97,81 @@ class CORSMiddleware(BaseMiddleware):
             if self.debug:
                 logger.error("Request denied: Missing 'Origin' header.")
             return response.json(self.get_error_message("missing_origin"), status_code=self.custom_error_status)
-        if method.lower() == "options" and "access-control-request-method" in request.headers:
+        if method == "OPTIONS" and "access-control-request-method" in request.headers:
             return await self.preflight_response(request, response)
         await self.simple_response(request, response,call_next)
 
 
-   
+
     async def simple_response(self, request: Request, response: Response,call_next :typing.Callable[..., typing.Awaitable[Any]]):
-        config = get_config().cors
         await call_next()
-        if not config:
+        if not self.enabled:
             return None
         origin = request.origin
 
-        if origin and self.is_allowed_origin(origin):
-            response.header("Access-Control-Allow-Origin",origin,overide=True)
+        headers = self._expose_header
+        if origin and self._origin_allowed(origin):
+            headers = ((b"access-control-allow-origin", origin.encode("latin-1")),) + self._credentials_header + headers
+        if headers:
+            response.headers.extend_raw(headers, replace=True)
 
-            if self.allow_credentials:
-                response.header("Access-Control-Allow-Credentials","true",overide=True)
-
-        if self.expose_headers:
-            response.header("Access-Control-Expose-Headers",  ", ".join(self.expose_headers),overide=True)
-            
 
     def is_allowed_origin(self, origin: Optional[str]) -> bool:
-        if origin in self.blacklist_origins:
+        return self._origin_allowed(origin)
+
+    def _check_origin(self, origin: Optional[str]) -> bool:
+        if origin in self._blacklist_origin_set:
             if self.debug:
                 logger.error(f"Request denied: Origin '{origin}' is blacklisted.")
 
             return False
 
-        if "*" in self.allow_origins:
+        if self._allow_all_origins:
 
             return True
 
-        if self.allow_origin_regex and self.allow_origin_regex.fullmatch(origin):
+        if self.allow_origin_regex and self.allow_origin_regex.fullmatch(origin or ""):
             return True
 
         if self.dynamic_origin_validator and callable(self.dynamic_origin_validator):
             return self.dynamic_origin_validator(origin)
 
-        return origin in self.allow_origins
+        return origin in self._allow_origin_set
     def is_allowed_method(self,method :Optional[str]) -> bool:
 
-        if "*" in self.allow_methods:
+        if self._allow_all_methods:
             return True
-        if not (method or "").lower() in [x.lower() for x in self.allow_methods]:
-
-            return False
-        return True
+        return (method or "").lower() in self._allow_method_set
     async def preflight_response(self, request: Request, response: Response) -> Any:
         origin = request.headers.get("origin")
         requested_method = request.headers.get("access-control-request-method")
         requested_headers = request.headers.get("access-control-request-headers")
 
-        headers = self.preflight_headers.copy()
+        key = (origin, requested_method, requested_headers)
+        preflight = self._preflights.get(key)
+        if preflight is None:
+            preflight = PreencodedResponse.from_response(
+                self._build_preflight(origin, requested_method, requested_headers)
+            )
+            self._preflights[key] = preflight
+            if len(self._preflights) > self.cache_size:
+                self._preflights.popitem(last=False)
+        else:
+            self._preflights.move_to_end(key)
+        return response.make_response(preflight)
 
+    def _build_preflight(
+        self, origin: Optional[str], requested_method: Optional[str], requested_headers: Optional[str]
+    ) -> JSONResponse:
+        """The preflight response for a combination of origin, method and headers."""
+        headers = self.preflight_headers.copy()
 
         if not self.is_allowed_origin(origin):
 
 
             if self.debug:
                 logger.error(f"Preflight request denied: Origin '{origin}' is not allowed.")
-            return response.json(self.get_error_message("disallowed_origin"), status_code=self.custom_error_status)
+            return JSONResponse(self.get_error_message("disallowed_origin"), status_code=self.custom_error_status)
 
         headers["Access-Control-Allow-Origin"] = origin #type:ignore
 
@@ -139,20 +180,20 @@ class CORSMiddleware(BaseMiddleware):
             if self.debug:
                 logger.error(f"Preflight request denied: Method '{requested_method}' is not allowed.")
 
-                return response.json(self.get_error_message("disallowed_method"), status_code=self.custom_error_status)
+            return JSONResponse(self.get_error_message("disallowed_method"), status_code=self.custom_error_status)
 
         if requested_headers:
             requested_header_list = [h.strip().lower() for h in requested_headers.split(",")]
-            if "*" in self.allow_headers:
+            if self._allow_all_headers:
                 headers["Access-Control-Allow-Headers"] = "*"
             else:
                 for header in requested_header_list:
-                    if header not in self.allow_headers or header in self.blacklist_headers:
+                    if header not in self._allow_header_set or header in self._blacklist_header_set:
                         if self.debug:
                             logger.error(f"Preflight request denied: Header '{header}' is not allowed.")
-                        return response.json(self.get_error_message("disallowed_header"), status_code=self.custom_error_status)
+                        return JSONResponse(self.get_error_message("disallowed_header"), status_code=self.custom_error_status)
                 headers["Access-Control-Allow-Headers"] = requested_headers
-        return response.json("OK", status_code=201, headers=headers)
+        return JSONResponse("OK", status_code=201, headers=headers)
 
     def get_error_message(self, error_type: str) -> str:
         return self.custom_error_messages.get(error_type, "CORS request denied.")
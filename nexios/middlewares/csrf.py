@@ -1,12 +1,17 @@
-import secrets,re,typing
+import hashlib,hmac,secrets,re,typing
+from functools import lru_cache
 from nexios.config import get_config
-from itsdangerous import URLSafeSerializer, BadSignature #type:ignore
 from nexios.middlewares.base import BaseMiddleware
 from nexios.http import Request, Response
 
 class CSRFMiddleware(BaseMiddleware):
     """
     Middleware to protect against Cross-Site Request Forgery (CSRF) attacks for Nexios.
+
+    Tokens are a random value and its HMAC under the app's `secret_key`. A
+    client keeps its token for as long as the cookie holds a valid one, and
+    up to `csrf_token_cache_size` verified tokens are remembered, so a safe
+    request costs a single lookup.
     """
     def __init__(self) -> None:
         app_config = get_config()
@@ -15,11 +20,17 @@ class CSRFMiddleware(BaseMiddleware):
             assert app_config.secret_key != None
         if not self.use_csrf:
             return
-        self.serializer = URLSafeSerializer(app_config.secret_key, "csrftoken")   #type:ignore
+        self.secret = str(app_config.secret_key).encode("utf-8")
         self.required_urls :typing.List[str]= app_config.csrf_required_urls or []
         self.exempt_urls = app_config.csrf_exempt_urls
+        self.all_urls_required = "*" in self.required_urls
+        self.required_patterns = self._compile_urls([url for url in self.required_urls if url != "*"])
+        self.exempt_patterns = self._compile_urls(self.exempt_urls or [])
+        self._token_is_valid = lru_cache(maxsize=app_config.csrf_token_cache_size or 4096)(self._verify_token)
         self.sensitive_cookies = app_config.csrf_sensitive_cookies
-        self.safe_methods = app_config.csrf_safe_methods or {"GET", "HEAD", "OPTIONS", "TRACE"}
+        self.safe_methods = frozenset(
+            method.upper() for method in (app_config.csrf_safe_methods or {"GET", "HEAD", "OPTIONS", "TRACE"})
+        )
         self.cookie_name = app_config.csrf_cookie_name or "csrftoken"
         self.cookie_path = app_config.csrf_cookie_path or "/"
         self.cookie_domain = app_config.csrf_cookie_domain
@@ -36,10 +47,10 @@ class CSRFMiddleware(BaseMiddleware):
         if not self.use_csrf:
             await call_next()
             return
-        csrf_cookie = request.cookies.get(self.cookie_name)
-        if request.method.upper() in self.safe_methods:
+        if request.method in self.safe_methods:
             await call_next()
             return
+        csrf_cookie = request.cookies.get(self.cookie_name)
         if self._url_is_required(request.url.path) or (
             self._url_is_exempt(request.url.path)
             and self._has_sensitive_cookies(request.cookies)
@@ -53,7 +64,6 @@ class CSRFMiddleware(BaseMiddleware):
 
             if not self._csrf_tokens_match(csrf_cookie, submitted_csrf_token):
                 return response.text("CSRF token incorrect", status_code=403)
-        response.delete_cookie(self.cookie_name)
         await call_next()
 
     async def process_response(self, request: Request, response: Response):
@@ -62,6 +72,9 @@ class CSRFMiddleware(BaseMiddleware):
         """
         if not self.use_csrf:
             return
+        csrf_cookie = request.cookies.get(self.cookie_name)
+        if csrf_cookie and self._token_is_valid(csrf_cookie):
+            return
         csrf_token = self._generate_csrf_token()
 
         response.set_cookie(
@@ -74,7 +87,7 @@ class CSRFMiddleware(BaseMiddleware):
             samesite=self.cookie_samesite,
         )
 
-    def _has_sensitive_cookies(self, cookies: typing.Dict[str,typing.Any]) -> bool:
+    def _has_sensitive_cookies(self, cookies: typing.Mapping[str,typing.Any]) -> bool:
         """Check if the request contains sensitive cookies."""
         if not self.sensitive_cookies:
             return True
@@ -83,39 +96,56 @@ class CSRFMiddleware(BaseMiddleware):
                 return True
         return False
 
-    def _url_is_required(self, url: str) -> bool:
-        """Check if the URL requires CSRF validation."""
-
-        if not self.required_urls:
-            return False
+    @staticmethod
+    def _compile_urls(urls: typing.List[str]) -> typing.List[typing.Pattern[str]]:
+        """
+        Compile URL patterns, joining them into one alternation where that
+        can't change their meaning. Patterns with groups (whose numbers and
+        backreferences would shift) or global inline flags such as `(?i)`
+        (which may only start a whole regex) are kept separate.
+        """
+        joinable: typing.List[str] = []
+        separate: typing.List[typing.Pattern[str]] = []
+        for url in urls:
+            pattern = re.compile(url)
+            if pattern.groups or pattern.flags != re.UNICODE:
+                separate.append(pattern)
+            else:
+                joinable.append(url)
+        if len(joinable) > 1:
+            return [re.compile("|".join(f"(?:{url})" for url in joinable)), *separate]
+        return [re.compile(url) for url in joinable] + separate
 
-        if "*" in self.required_urls:
-            return True
-        for required_url in self.required_urls:
-            match = re.match(required_url, url)
-            if match and match.group() == url:
+    @staticmethod
+    def _matches(patterns: typing.List[typing.Pattern[str]], url: str) -> bool:
+        for pattern in patterns:
+            if pattern.fullmatch(url) is not None:
                 return True
         return False
 
+    def _url_is_required(self, url: str) -> bool:
+        """Check if the URL requires CSRF validation."""
+        if self.all_urls_required:
+            return True
+        return self._matches(self.required_patterns, url)
+
     def _url_is_exempt(self, url: str) -> bool:
         """Check if the URL is exempt from CSRF validation."""
-        if not self.exempt_urls:
-            return False
-        for exempt_url in self.exempt_urls:
-            match = re.match(exempt_url, url)
-            if match and match.group() == url:
-                return True
-        return False
+        return self._matches(self.exempt_patterns, url)
+
+    def _sign(self, value: str) -> str:
+        return hmac.new(self.secret, b"csrftoken:" + value.encode("utf-8"), hashlib.sha256).hexdigest()
 
     def _generate_csrf_token(self) -> str: #type:ignore
         """Generate a secure CSRF token."""
-        return self.serializer.dumps(secrets.token_urlsafe(32))  #type:ignore
+        value = secrets.token_urlsafe(32)
+        return f"{value}.{self._sign(value)}"
+
+    def _verify_token(self, token: str) -> bool:
+        """Check that a token was signed with this app's secret key."""
+        value, _, signature = token.rpartition(".")
+        return bool(value) and hmac.compare_digest(signature.encode("utf-8"), self._sign(value).encode("utf-8"))
 
     def _csrf_tokens_match(self, token1: str, token2: str) -> bool:
         """Compare two CSRF tokens securely."""
-        try:
-            decoded1 = self.serializer.loads(token1) #type:ignore
-            decoded2 = self.serializer.loads(token2)  #type:ignore
-            return secrets.compare_digest(decoded1, decoded2) #type:ignore
-        except BadSignature:
-            return False
+        return hmac.compare_digest(token1.encode("utf-8"), token2.encode("utf-8")) and self._token_is_valid(token1)
@@ -1,54 +1,209 @@
-
-#Experimental
-
 import gzip
-from io import BytesIO
+import typing
+import zlib
+from collections import Counter
+import anyio
+import anyio.to_thread
 from typing import Callable, Any
 from nexios.middlewares.base import BaseMiddleware
 from nexios.http import Request, Response
 from nexios.config import get_config
 
+DEFAULT_CONTENT_TYPES = [
+    'text/plain',
+    'text/html',
+    'text/css',
+    'text/csv',
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'application/xml',
+]
+
+
+def _option(config: Any, name: str, default: Any) -> Any:
+    value = getattr(config, name, None) if config is not None else None
+    return default if value is None else value
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Whether an `Accept-Encoding` header allows a response in `coding` (e.g. "gzip" or "br")."""
+    aliases = ("gzip", "x-gzip") if coding == "gzip" else (coding,)
+    wildcard = False
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        name = name.strip()
+        if name not in aliases and name != "*":
+            continue
+        accepted = True
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                accepted = float(quality[2:]) > 0
+            except ValueError:
+                accepted = False
+        if name != "*":
+            # A coding named explicitly wins over the wildcard.
+            return accepted
+        wildcard = accepted
+    return wildcard
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an `Accept-Encoding` header allows a gzip-encoded response."""
+    return accepts_encoding(accept_encoding, "gzip")
+
+
 class GzipMiddleware(BaseMiddleware):
+    """
+    Compresses responses for clients that accept gzip.
+
+    Buffered responses up to `max_buffered_size` bytes are compressed in one
+    go and keep a `Content-Length`. Streamed responses, files and larger
+    bodies are compressed chunk by chunk as they are sent, with a sync flush
+    after every chunk so each one reaches the client as soon as it is
+    produced.
+
+    Bodies and chunks of at least `threadpool_threshold` bytes are compressed
+    in a worker thread (zlib releases the GIL), at most `max_workers` at a
+    time. The level drops to `large_body_level` for bodies of
+    `large_body_size` bytes or more, and to 1 while every worker is busy.
+    Each decision is counted in `stats`.
+    """
+
     def __init__(self):
         config = get_config().gzip if hasattr(get_config(), 'gzip') else None
-        self.minimum_size = getattr(config, 'minimum_size', 500)  
-        self.content_types = getattr(config, 'content_types', [
-            'text/plain',
-            'text/html',
-            'text/css',
-            'application/javascript',
-            'application/json',
-            'application/xml'
-        ])
-        self.compression_level = getattr(config, 'compression_level', 6) 
+        self.minimum_size = _option(config, 'minimum_size', 500)
+        self.content_types = _option(config, 'content_types', DEFAULT_CONTENT_TYPES)
+        self.compression_level = _option(config, 'compression_level', 6)
+        self.max_buffered_size = _option(config, 'max_buffered_size', 1024 * 1024)
+        self.threadpool_threshold = _option(config, 'threadpool_threshold', 64 * 1024)
+        self.max_workers = _option(config, 'max_workers', 4)
+        self.large_body_size = _option(config, 'large_body_size', 1024 * 1024)
+        self.large_body_level = _option(config, 'large_body_level', 4)
+        self.stats: typing.Counter[str] = Counter()
+        self._limiter: typing.Optional[anyio.CapacityLimiter] = None
+        self._pending = 0
 
     async def process_request(self, request: Request, response: Response, call_next: Callable[..., Any]):
-        accept_encoding = request.headers.get('Accept-Encoding', '')
-        if 'gzip' not in accept_encoding.lower():
-            await call_next()
-            return
         await call_next()
-        if  self.should_compress(response):
-            self.compress_response(response)
+        if not self.is_compressible(response):
+            return
+        # The body now depends on Accept-Encoding, whether or not this client sent it.
+        self.add_vary(response)
+        if accepts_gzip(request.headers.get('accept-encoding', '')) and self.should_compress(response):
+            await self.compress_response(response)
+        else:
+            self.stats['skipped'] += 1
+
+    def is_compressible(self, response: Response) -> bool:
+        headers = response.headers
+        status_code = response.get_response().status_code
+        if status_code < 200 or status_code in (204, 206, 304):
+            return False
+        if 'content-encoding' in headers or 'content-range' in headers:
+            return False
+        content_type = (headers.get('content-type') or '').split(';', 1)[0].strip().lower()
+        return content_type in self.content_types
 
     def should_compress(self, response: Response) -> bool:
-        content_length = int(response.headers.get('Content-Length', "0") or 0) #dirty code, fix later
-        content_type = response.content_type #type:ignore
-       
-        return (
-            content_length >= self.minimum_size and
-            content_type in self.content_types
-        )
-
-    def compress_response(self, response: Response):
-        buffer = BytesIO()
-        with gzip.GzipFile(mode='wb', fileobj=buffer, compresslevel=self.compression_level) as gzip_file:
-            gzip_file.write(response.body)
-
-        response.resp(buffer.getvalue())
-        response.header('Content-Encoding', 'gzip')
-        response.header('Content-Length',str(len(response.body)),overide=True)
-        response.header('Vary','Accept-Encoding')
+        content_length = response.headers.get('content-length')
+        # Streams have no length and are always compressed.
+        return content_length is None or int(content_length) >= self.minimum_size
+
+    @staticmethod
+    def add_vary(response: Response) -> None:
+        headers = response.headers
+        vary = [name.strip().lower() for value in headers.getlist('vary') for name in value.split(',')]
+        if 'accept-encoding' not in vary and '*' not in vary:
+            response.header('vary', 'Accept-Encoding')
+
+    def choose_level(self, size: typing.Optional[int]) -> int:
+        """Pick a compression level for a body of `size` bytes (None if unknown) under the current load."""
+        if self._pending >= self.max_workers:
+            level = 1
+            self.stats['level_saturated'] += 1
+        elif size is not None and size >= self.large_body_size:
+            level = min(self.compression_level, self.large_body_level)
+            self.stats['level_large_body'] += 1
+        else:
+            level = self.compression_level
+        self.stats[f'level_{level}'] += 1
+        return level
+
+    async def run_compression(self, func: Callable[..., bytes], data: bytes, *args: Any) -> bytes:
+        """Run `func(data, *args)` inline for small inputs and in the bounded thread pool otherwise."""
+        self.stats['bytes_in'] += len(data)
+        if len(data) < self.threadpool_threshold:
+            self.stats['inline'] += 1
+            result = func(data, *args)
+        else:
+            if self._limiter is None:
+                self._limiter = anyio.CapacityLimiter(self.max_workers)
+            self.stats['offloaded'] += 1
+            self._pending += 1
+            try:
+                result = await anyio.to_thread.run_sync(func, data, *args, limiter=self._limiter)
+            finally:
+                self._pending -= 1
+        self.stats['bytes_out'] += len(result)
+        return result
+
+    async def compress_response(self, response: Response):
+        inner = response.get_response()
+        content_length = response.headers.get('content-length')
+        size = int(content_length) if content_length is not None else None
+        iterator = getattr(inner, 'content_iterator', None)
+        level = self.choose_level(size)
+        response.header('content-encoding', 'gzip', overide=True)
+        self.stats['compressed'] += 1
+        # The gzip bytes differ from the identity ones, so the validator can
+        # no longer be strong, and ranges of them can't be served.
+        etag = response.headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            response.header('etag', f'W/{etag}', overide=True)
+        del response.headers['accept-ranges']
+
+        if iterator is None or (size is not None and size <= self.max_buffered_size):
+            body = await self._read_body(inner)
+            compressed = await self.run_compression(gzip.compress, body, level)
+            if iterator is None:
+                inner._body = compressed
+            else:
+                inner.content_iterator = self._single_chunk(compressed)
+            response.header('content-length', str(len(compressed)), overide=True)
+            return
+
+        del response.headers['content-length']
+        inner.content_iterator = self._compress_stream(iterator, level)
+
+    @staticmethod
+    async def _read_body(inner: Any) -> bytes:
+        iterator = getattr(inner, 'content_iterator', None)
+        if iterator is None:
+            return bytes(inner.body)
+        chunks: typing.List[bytes] = []
+        async for chunk in iterator:
+            chunks.append(chunk if isinstance(chunk, bytes) else bytes(chunk))
+        return b''.join(chunks)
+
+    @staticmethod
+    async def _single_chunk(body: bytes) -> typing.AsyncGenerator[bytes, None]:
+        yield body
+
+    async def _compress_stream(self, iterator: typing.AsyncIterable[bytes], level: int) -> typing.AsyncGenerator[bytes, None]:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+        def compress_chunk(chunk: bytes) -> bytes:
+            return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        async for chunk in iterator:
+            if not chunk:
+                continue
+            data = await self.run_compression(compress_chunk, chunk)
+            if data:
+                yield data
+        yield compressor.flush()
 
     async def process_response(self, request: Request, response: Response):
-        pass
\ No newline at end of file
+        pass
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, List, Optional, Pattern,Dict,TypeVar,Tuple,Callable,Union
 from dataclasses import dataclass
+import inspect
 import re
 import warnings,typing
 from enum import Enum
@@ -11,12 +12,13 @@ from typing_extensions import Doc,Annotated #type: ignore
 from nexios.structs import URLPath,RouteParam
 from nexios.http import Request,Response
 from nexios.http.response import JSONResponse
+from nexios.http.request import _config_limit
 from nexios.types import Scope,Send,Receive,ASGIApp
 from .routing_utils import Convertor,CONVERTOR_TYPES,get_route_path
 from nexios.websockets import WebSocket
 from nexios.middlewares.core import BaseMiddleware
 from nexios.middlewares.core import Middleware, wrap_middleware
-from nexios.exceptions import NotFoundException
+from nexios.exceptions import NotFoundException, RequestEntityTooLarge
 from nexios.websockets.errors import WebSocketErrorMiddleware
 T = TypeVar("T")
 allowed_methods_default = ['get','post','delete','put','patch','options']
@@ -39,7 +41,7 @@ def request_response(
         
         await func(request, response_manager)
         response = response_manager.get_response()
-        return await response(scope, receive, send)
+        await response(scope, receive, send)
 
 
     return app
@@ -296,6 +298,14 @@ class Routes:
         ] = None,
         name :Optional[str] = None,
         middlewares :List[Any] = [],
+        max_body_size: Annotated[
+            Optional[int],
+            Doc("""
+            Maximum request body size in bytes for this endpoint, overriding the
+            app-wide `max_body_size` config value. Requests declaring a larger
+            `Content-Length` are rejected with 413 before the handler runs.
+            """)
+        ] = None,
         **kwargs :Dict[str,Any]
     ):
         """
@@ -329,6 +339,7 @@ class Routes:
         self.param_names = self.route_info.param_names
         self.route_type = self.route_info.route_type
         self.middlewares :typing.List[MiddlewareType] = list(middlewares)
+        self.max_body_size = max_body_size
         self.kwargs = kwargs
     def match(self, path: str, method:str) -> typing.Tuple[Any,Any,Any]:
         """
@@ -404,6 +415,17 @@ class Routes:
             for cls, args, kwargs in reversed(middleware):
                 app = cls(app, *args, **kwargs)
             return app
+        if self.max_body_size is not None:
+            scope["max_body_size"] = self.max_body_size
+            max_body_size = self.max_body_size
+        else:
+            max_body_size = _config_limit("max_body_size")
+        if max_body_size is not None:
+            for key, value in scope["headers"]:
+                if key == b"content-length":
+                    if value.isdigit() and int(value) > max_body_size:
+                        raise RequestEntityTooLarge(f"Request body exceeds the limit of {max_body_size} bytes.")
+                    break
         app = await apply_middlewares(request_response(self.handler))
         
         await app(scope, receive, send)
@@ -792,7 +814,11 @@ class Router(BaseRouter):
         middlewares : Annotated[
             List[Any],
             Doc("Optional Middleware that should be executed before the route handler")
-        ] = []
+        ] = [],
+        **kwargs: Annotated[
+            Dict[str, Any],
+            Doc("Additional arguments to pass to the Routes class, e.g. `max_body_size`.")
+        ]
     ) -> Callable[...,Any]:
         """
         Registers a route with the specified HTTP methods and an optional validator.
@@ -822,7 +848,7 @@ class Router(BaseRouter):
                            methods=methods, 
                            name=name,
                            middlewares = middlewares,
-                           
+                           **kwargs
                            )
             self.add_route(route)
             return _handler  
@@ -847,6 +873,24 @@ class Router(BaseRouter):
             if route.name == _name:
                 return route.url_path_for(_name, **path_params)
         raise ValueError(f"Route name '{_name}' not found in router.")
+
+    def static_url(self, _name: str, path: str) -> URLPath:
+        """
+        Generate the URL of a static file served by the `StaticFilesHandler`
+        route with the given name, using the file's content-hashed name when
+        the handler has `hashed_urls` enabled.
+
+        Raises:
+            ValueError: If no static files route has the given name.
+        """
+        from nexios.static import StaticFilesHandler
+
+        for route in self.routes:
+            # Matching a request wraps the handler in `allowed_methods`.
+            handler = inspect.unwrap(route.handler) if route.handler is not None else None
+            if route.name == _name and isinstance(handler, StaticFilesHandler):
+                return URLPath(path=f"/{handler.url_prefix}{handler.url_path(path)}", protocol="http")
+        raise ValueError(f"Static files route '{_name}' not found in router.")
     def __repr__(self) -> str:
         return f"<Router prefix='{self.prefix}' routes={len(self.routes)}>"
 
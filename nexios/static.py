@@ -1,22 +1,153 @@
-from pathlib import Path
-from pathlib import Path
+from collections import OrderedDict
+from email.utils import formatdate
+import hashlib
+from pathlib import Path, PurePosixPath
+import mimetypes
 import os
-from typing import Union
+from typing import Dict, List, Optional, Tuple, Union
+import anyio.to_thread
 from nexios.http.request import Request
-from nexios.http.response import NexiosResponse
+from nexios.http.response import FileResponse, NexiosResponse, PreencodedResponse, is_not_modified
+from nexios.middlewares.gzip import accepts_encoding
+
+# Precompressed siblings, in order of preference.
+PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+# Sent with content-hashed URLs, whose contents can never change.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class StaticFile:
+    """A file recorded in the manifest: its path, stat result and content type."""
+
+    __slots__ = ("path", "stat", "content_type", "sidecars")
+
+    def __init__(self, path: str, stat: os.stat_result, content_type: str) -> None:
+        self.path = path
+        self.stat = stat
+        self.content_type = content_type
+        self.sidecars: List[Tuple[str, "StaticFile"]] = []
+
+
 class StaticFilesHandler:
-    
-    def __init__(self, directory: Union[str, Path], url_prefix: str = "/static/"):
-        
+    """
+    Serves the files under `directory`.
+
+    With `manifest`, every file is recorded once at startup (and on
+    `refresh()`), so a request costs a dict lookup instead of path
+    resolution and stat calls, and files up to `max_memory_file_size` bytes
+    are served from a least-recently-used memory cache of
+    `memory_cache_size` bytes with their headers encoded in advance.
+
+    With `hashed_urls`, every file is also reachable under a name carrying a
+    hash of its contents (`app.3f9a1c2b4d5e.js`, see `url_path()`), which is
+    served with a far-future immutable `Cache-Control`.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        url_prefix: str = "/static/",
+        precompressed: bool = True,
+        manifest: bool = False,
+        memory_cache_size: int = 16 * 1024 * 1024,
+        max_memory_file_size: int = 64 * 1024,
+        hashed_urls: bool = False,
+    ):
+
         self.directory = Path(directory).resolve()
         self.url_prefix = url_prefix.strip("/") + "/"
-        
+        self.precompressed = precompressed
+        self.use_manifest = manifest
+        self.memory_cache_size = memory_cache_size
+        self.max_memory_file_size = max_memory_file_size
+        self.hashed_urls = hashed_urls
+
         if not self.directory.exists():
             os.makedirs(self.directory)
-        
+
         if not self.directory.is_dir():
             raise ValueError(f"{directory} is not a directory")
 
+        self._sidecars: Dict[str, List[Tuple[str, str]]] = {}
+        self._manifest: Dict[str, StaticFile] = {}
+        self._hashed_names: Dict[str, str] = {}
+        self._unhashed_names: Dict[str, str] = {}
+        self._memory: "OrderedDict[Tuple[str, Optional[str], bool], Tuple[PreencodedResponse, PreencodedResponse]]" = OrderedDict()
+        self._memory_size = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rescan the directory, e.g. after a deploy added or removed files."""
+        if self.precompressed:
+            self._sidecars = self._find_sidecars()
+        if self.use_manifest:
+            self._manifest = self._build_manifest()
+            self._memory.clear()
+            self._memory_size = 0
+        if self.hashed_urls:
+            self._hashed_names = self._hash_files()
+            self._unhashed_names = {hashed: name for name, hashed in self._hashed_names.items()}
+
+    def url_path(self, path: str) -> str:
+        """
+        The path to request for a file, relative to the URL prefix: its
+        content-hashed name when `hashed_urls` is on and the file is known,
+        otherwise `path` unchanged.
+        """
+        path = path.lstrip("/")
+        return self._hashed_names.get(path, path)
+
+    def _hash_files(self) -> Dict[str, str]:
+        """Map every file's relative path to its name with a blake2b hash of its contents inserted."""
+        hashed_names: Dict[str, str] = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if not self._is_safe_path(Path(path)) or not os.path.isfile(path):
+                    continue
+                digest = hashlib.blake2b(digest_size=6)
+                with open(path, "rb") as file:
+                    for chunk in iter(lambda: file.read(64 * 1024), b""):
+                        digest.update(chunk)
+                key = PurePosixPath(Path(path).relative_to(self.directory).as_posix())
+                hashed = f"{key.stem}.{digest.hexdigest()}{key.suffix}"
+                hashed_names[key.as_posix()] = key.with_name(hashed).as_posix()
+        return hashed_names
+
+    def _find_sidecars(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Map every file that has `.br`/`.gz` siblings to `(encoding, sibling path)` pairs."""
+        sidecars: Dict[str, List[Tuple[str, str]]] = {}
+        for root, _, files in os.walk(self.directory):
+            names = set(files)
+            for name in files:
+                for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+                    if name.endswith(suffix) and name[: -len(suffix)] in names:
+                        original = os.path.join(root, name[: -len(suffix)])
+                        sidecars.setdefault(original, []).append((encoding, os.path.join(root, name)))
+        order = [encoding for encoding, _ in PRECOMPRESSED_SUFFIXES]
+        for siblings in sidecars.values():
+            siblings.sort(key=lambda sibling: order.index(sibling[0]))
+        return sidecars
+
+    def _build_manifest(self) -> Dict[str, StaticFile]:
+        """Record every servable file under its URL path relative to the directory."""
+        manifest: Dict[str, StaticFile] = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if not self._is_safe_path(Path(path)) or not os.path.isfile(path):
+                    continue
+                content_type, _ = mimetypes.guess_type(path)
+                key = Path(path).relative_to(self.directory).as_posix()
+                manifest[key] = StaticFile(path, os.stat(path), content_type or "application/octet-stream")
+        by_path = {entry.path: entry for entry in manifest.values()}
+        for original, siblings in self._sidecars.items():
+            if original in by_path:
+                entry = by_path[original]
+                entry.sidecars = [(encoding, by_path[sibling]) for encoding, sibling in siblings if sibling in by_path]
+        return manifest
+
     def _is_safe_path(self, path: Path) -> bool:
         """Check if the path is safe to serve"""
         try:
@@ -29,18 +160,124 @@ class StaticFilesHandler:
         path = request.url.path
         if path.startswith("/"):
             path = path[1:]
-        
+
         if path.startswith(self.url_prefix.strip("/")):
             path = path[len(self.url_prefix.strip("/")):]
-        
+
+        original = self._unhashed_names.get(path.lstrip("/"))
+        immutable = original is not None
+        if original is not None:
+            path = "/" + original
+
+        if self.use_manifest:
+            return await self._serve_from_manifest(request, response, path.lstrip("/"), immutable)
+
         file_path = f"{self.directory}{path}"
         if not self._is_safe_path(Path(file_path)):
             return response.status(403)
-            
-        
+
+
         if not os.path.exists(file_path) or not os.path.isfile(file_path):
             return response.json("Resource not found !",status_code = 404)
-            
+
+        if immutable:
+            response.header("cache-control", IMMUTABLE_CACHE_CONTROL)
+        siblings = self._sidecars.get(file_path)
+        if siblings:
+            response.header("vary", "Accept-Encoding")
+            accept_encoding = request.headers.get("accept-encoding", "")
+            for encoding, sibling in siblings:
+                if accepts_encoding(accept_encoding, encoding):
+                    content_type, _ = mimetypes.guess_type(file_path)
+                    response.file(
+                        sibling,
+                        filename=os.path.basename(file_path),
+                        content_disposition_type="inline",
+                        content_type=content_type or "application/octet-stream",
+                    )
+                    response.header("content-encoding", encoding)
+                    return
 
         response.file(file_path,content_disposition_type="inline")
-  
\ No newline at end of file
+
+    async def _serve_from_manifest(self, request: Request, response: NexiosResponse, key: str, immutable: bool = False):
+        entry = self._manifest.get(key)
+        if entry is None:
+            return response.json("Resource not found !",status_code = 404)
+
+        selected, encoding = entry, None
+        accept_encoding = request.headers.get("accept-encoding", "")
+        for sibling_encoding, sibling in entry.sidecars:
+            if accepts_encoding(accept_encoding, sibling_encoding):
+                selected, encoding = sibling, sibling_encoding
+                break
+
+        if selected.stat.st_size <= self.max_memory_file_size and "range" not in request.headers:
+            cached = await self._memory_responses(entry, selected, encoding, immutable)
+            if cached is not None:
+                ok, not_modified = cached
+                if request.method in ("GET", "HEAD") and is_not_modified(
+                    request.headers, FileResponse.stat_etag(selected.stat), selected.stat.st_mtime
+                ):
+                    return response.make_response(not_modified)
+                return response.make_response(ok)
+
+        if immutable:
+            response.header("cache-control", IMMUTABLE_CACHE_CONTROL)
+        if entry.sidecars:
+            response.header("vary", "Accept-Encoding")
+        response.file(
+            selected.path,
+            filename=os.path.basename(entry.path),
+            content_disposition_type="inline",
+            content_type=entry.content_type,
+            stat_result=selected.stat,
+        )
+        if encoding is not None:
+            response.header("content-encoding", encoding)
+
+    async def _memory_responses(
+        self, entry: StaticFile, selected: StaticFile, encoding: Optional[str], immutable: bool = False
+    ) -> Optional[Tuple[PreencodedResponse, PreencodedResponse]]:
+        """The full and `304` responses for a small file, read into memory on first use."""
+        cache_key = (entry.path, encoding, immutable)
+        cached = self._memory.get(cache_key)
+        if cached is not None:
+            self._memory.move_to_end(cache_key)
+            return cached
+        size = selected.stat.st_size
+        if size > self.memory_cache_size:
+            return None
+
+        try:
+            body = await anyio.to_thread.run_sync(Path(selected.path).read_bytes)
+        except OSError:
+            return None
+        if len(body) != size:
+            # Changed since the manifest was built; serve it from disk instead.
+            return None
+        headers = {
+            "content-type": entry.content_type,
+            "content-disposition": f'inline; filename="{os.path.basename(entry.path)}"',
+            "accept-ranges": "bytes",
+            "last-modified": formatdate(selected.stat.st_mtime, usegmt=True),
+            "etag": FileResponse.stat_etag(selected.stat),
+        }
+        if immutable:
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        if entry.sidecars:
+            headers["vary"] = "Accept-Encoding"
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        ok = PreencodedResponse(body, headers=headers)
+        not_modified = PreencodedResponse(b"", 304, headers={
+            key: value for key, value in headers.items() if key not in ("content-type", "content-disposition")
+        })
+        cached = (ok, not_modified)
+
+        self._memory[cache_key] = cached
+        self._memory_size += size
+        while self._memory_size > self.memory_cache_size:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted.body)
+        return cached
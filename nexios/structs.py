@@ -1,5 +1,7 @@
 from __future__ import annotations
 import typing
+from email.message import Message as _EmailMessage
+from email.utils import collapse_rfc2231_value
 from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit
 from nexios._utils.cuncurrency import run_in_threadpool
 
@@ -14,6 +16,38 @@ class Address(typing.NamedTuple):
     port: int
 
 
+class ContentType(typing.NamedTuple):
+    """
+    A parsed `Content-Type` header: the lower-cased media type and its
+    parameters, with `charset` and `boundary` exposed as properties.
+    """
+
+    media_type: str
+    options: typing.Dict[str, str]
+
+    @property
+    def charset(self) -> typing.Optional[str]:
+        return self.options.get("charset")
+
+    @property
+    def boundary(self) -> typing.Optional[bytes]:
+        boundary = self.options.get("boundary")
+        return boundary.encode("latin-1") if boundary else None
+
+    @classmethod
+    def parse(cls, value: typing.Optional[str]) -> "ContentType":
+        if not value:
+            return cls("", {})
+        if ";" not in value:
+            return cls(value.strip().lower(), {})
+        message = _EmailMessage()
+        message["content-type"] = value
+        params = message.get_params() or [("", "")]
+        media_type = params[0][0].strip().lower()
+        options = {key: collapse_rfc2231_value(param) for key, param in params[1:]}
+        return cls(media_type, options)
+
+
 _KeyType = typing.TypeVar("_KeyType")
 # Mapping keys are invariant but their values are covariant since
 # you can only read them
@@ -592,6 +626,99 @@ class MutableHeaders(Headers):
         self["vary"] = vary
 
 
+class ResponseHeaders(MutableHeaders):
+    """
+    Mutable headers over a raw `(bytes, bytes)` list, with a count of each
+    lower-cased header name so membership checks don't scan the list.
+    The list is shared, not copied: `raw` is the exact list sent to the
+    server.
+    """
+
+    def __init__(self, raw: typing.Optional[typing.List[typing.Tuple[bytes, bytes]]] = None) -> None:
+        super().__init__(raw=raw if raw is not None else [])
+        self._index: typing.Dict[bytes, int] = {}
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        index: typing.Dict[bytes, int] = {}
+        for key, _ in self._list:
+            index[key] = index.get(key, 0) + 1
+        self._index = index
+
+    def set_raw(self, raw: typing.List[typing.Tuple[bytes, bytes]]) -> None:
+        """Replace the underlying list, e.g. with headers received from downstream."""
+        self._list = raw
+        self._rebuild_index()
+
+    def add_raw(self, key: bytes, value: bytes, replace: bool = False) -> None:
+        """
+        Add an already encoded, lower-cased header. With `replace`, any
+        existing values for `key` are dropped first.
+        """
+        if replace and key in self._index:
+            self._list[:] = [item for item in self._list if item[0] != key]
+            del self._index[key]
+        self._list.append((key, value))
+        self._index[key] = self._index.get(key, 0) + 1
+
+    def extend_raw(self, items: typing.Sequence[typing.Tuple[bytes, bytes]], replace: bool = False) -> None:
+        """
+        Add several already encoded, lower-cased headers in one go. With
+        `replace`, any existing values for their keys are dropped first.
+        """
+        index = self._index
+        if replace:
+            replaced = {key for key, _ in items if key in index}
+            if replaced:
+                self._list[:] = [item for item in self._list if item[0] not in replaced]
+                for key in replaced:
+                    del index[key]
+        self._list.extend(items)
+        for key, _ in items:
+            index[key] = index.get(key, 0) + 1
+
+    def clear(self) -> None:
+        self._list.clear()
+        self._index.clear()
+
+    def __getitem__(self, key: str):  # type: ignore[override]
+        if key.lower().encode("latin-1") not in self._index:
+            return None
+        return super().__getitem__(key)
+
+    def __contains__(self, key: typing.Any) -> bool:
+        return key.lower().encode("latin-1") in self._index
+
+    def getlist(self, key: str) -> typing.List[str]:
+        if key.lower().encode("latin-1") not in self._index:
+            return []
+        return super().getlist(key)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._index[key.lower().encode("latin-1")] = 1
+
+    def __delitem__(self, key: str) -> None:
+        del_key = key.lower().encode("latin-1")
+        if del_key in self._index:
+            super().__delitem__(key)
+            del self._index[del_key]
+
+    def setdefault(self, key: str, value: str) -> str:
+        if key in self:
+            return self[key]
+        self.append(key, value)
+        return value
+
+    def append(self, key: str, value: str) -> None:
+        super().append(key, value)
+        append_key = key.lower().encode("latin-1")
+        self._index[append_key] = self._index.get(append_key, 0) + 1
+
+    def mutablecopy(self) -> "MutableHeaders":
+        return ResponseHeaders(raw=self._list[:])
+
+
 class State:
     """
     An object that can be used to store arbitrary state.
@@ -0,0 +1,136 @@
+import anyio
+import pytest
+
+from nexios import NexiosApp, get_application
+from nexios.http import Request, Response
+from nexios.middlewares.cache import CachedResponse, CacheStorage, FileCacheStorage, HTTPCacheMiddleware, MemoryCacheStorage
+from nexios.testing import Client
+
+app: NexiosApp = get_application()
+now = [1000.0]
+cache = HTTPCacheMiddleware(MemoryCacheStorage(max_bytes=4096), clock=lambda: now[0])
+app.add_middleware(cache)
+calls = []
+
+
+@app.get("/cache/public")
+async def public(req: Request, res: Response):
+    calls.append("public")
+    return res.json({"call": len(calls)}).header("cache-control", "public, max-age=60, stale-while-revalidate=30")
+
+
+@app.get("/cache/private")
+async def private(req: Request, res: Response):
+    calls.append("private")
+    return res.cache(max_age=60).json({"call": len(calls)})
+
+
+@app.get("/cache/shared")
+async def shared(req: Request, res: Response):
+    calls.append("shared")
+    return res.cache(max_age=60, private=False).json({"call": len(calls)})
+
+
+@app.get("/cache/vary")
+async def vary(req: Request, res: Response):
+    calls.append(req.headers.get("accept-language"))
+    res.header("cache-control", "max-age=60").header("vary", "Accept-Language")
+    return res.text(req.headers.get("accept-language", "none"))
+
+
+@app.get("/cache/cookie")
+async def cookie(req: Request, res: Response):
+    calls.append("cookie")
+    return res.set_cookie("a", "1").header("cache-control", "max-age=60").text("hi")
+
+
+@pytest.fixture
+async def async_client():
+    await cache.storage.clear()
+    calls.clear()
+    now[0] = 1000.0
+    async with Client(app) as c:
+        yield c
+
+
+async def test_shared_cache_hits(async_client: Client):
+    first = await async_client.get("/cache/public")
+    second = await async_client.get("/cache/public")
+    assert first.json() == second.json() == {"call": 1}
+    assert second.headers["age"] == "0"
+    assert second.headers["content-type"] == "application/json"
+
+    response = await async_client.get("/cache/public", headers={"cache-control": "no-cache"})
+    assert response.json() == {"call": 2}
+
+    await async_client.get("/cache/shared")
+    response = await async_client.get("/cache/shared")
+    assert response.json() == {"call": 3}
+    assert response.status_code == 200
+
+    etag = response.headers["etag"]
+    response = await async_client.get("/cache/shared", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert calls == ["public", "public", "shared"]
+
+
+async def test_private_and_cookie_responses_are_not_stored(async_client: Client):
+    for _ in range(2):
+        await async_client.get("/cache/private")
+        await async_client.get("/cache/cookie")
+    assert calls == ["private", "cookie", "private", "cookie"]
+
+
+async def test_vary(async_client: Client):
+    for language in ("en", "fr", "en", "fr"):
+        response = await async_client.get("/cache/vary", headers={"accept-language": language})
+        assert response.text == language
+    assert calls == ["en", "fr"]
+    # Each variant is stored once; the bare key only holds a small index.
+    bodies = [entry.body for entry in cache.storage._entries.values()]
+    assert sorted(bodies) == [b"", b"en", b"fr"]
+
+
+async def test_stale_while_revalidate(async_client: Client):
+    await async_client.get("/cache/public")
+    now[0] += 70
+    response = await async_client.get("/cache/public")
+    assert response.json() == {"call": 1}
+    assert response.headers["age"] == "70"
+    for _ in range(50):
+        if len(calls) == 2 and not cache._refreshing:
+            break
+        await anyio.sleep(0.01)
+    assert calls == ["public", "public"]
+
+    response = await async_client.get("/cache/public")
+    assert response.json() == {"call": 2}
+
+    now[0] += 200
+    response = await async_client.get("/cache/public")
+    assert response.json() == {"call": 3}
+
+
+async def test_memory_storage_evicts_by_size():
+    storage = MemoryCacheStorage(max_bytes=100)
+    for key in ("a", "b", "c"):
+        await storage.set(key, CachedResponse(200, [], b"x" * 40, 0, 1, 1))
+    assert await storage.get("a") is None
+    assert await storage.get("c") is not None
+    assert storage.size == 80
+
+
+def test_cache_storage_is_abstract():
+    with pytest.raises(TypeError):
+        CacheStorage()  # type: ignore
+
+
+async def test_file_storage_round_trip(tmp_path):
+    storage = FileCacheStorage(tmp_path)
+    entry = CachedResponse(200, [(b"content-type", b"text/plain")], b"body\nwith lines", 1, 2, 3, ("accept",), ("*/*",))
+    await storage.set("GET:/x", entry)
+    loaded = await storage.get("GET:/x")
+    assert loaded is not None
+    assert (loaded.body, loaded.headers, loaded.vary_values) == (entry.body, entry.headers, entry.vary_values)
+    await storage.delete("GET:/x")
+    assert await storage.get("GET:/x") is None
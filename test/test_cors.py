@@ -0,0 +1,79 @@
+import pytest
+
+from nexios import MakeConfig, NexiosApp, get_application
+from nexios.http import Request, Response
+from nexios.testing import Client
+
+validated = []
+
+
+def validate_origin(origin):
+    validated.append(origin)
+    return origin in ("https://dynamic.example", "https://example.com")
+
+
+app: NexiosApp = get_application(config=MakeConfig({
+    "cors": {
+        "allow_origins": ["https://example.com"],
+        "blacklist_origins": ["https://blocked.example"],
+        "allow_methods": ["GET", "POST"],
+        "allow_headers": ["Authorization"],
+        "expose_headers": ["X-Total"],
+        "dynamic_origin_validator": validate_origin,
+    }
+}))
+
+
+@app.get("/cors")
+async def index(req: Request, res: Response):
+    return res.json({"ok": True})
+
+
+@pytest.fixture
+async def async_client():
+    async with Client(app) as c:
+        yield c
+
+
+async def test_simple_requests(async_client: Client):
+    response = await async_client.get("/cors", headers={"origin": "https://example.com"})
+    assert response.headers["access-control-allow-origin"] == "https://example.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-expose-headers"] == "X-Total"
+
+    response = await async_client.get("/cors", headers={"origin": "https://blocked.example"})
+    assert "access-control-allow-origin" not in response.headers
+
+    response = await async_client.get("/cors")
+    assert "access-control-allow-origin" not in response.headers
+
+
+async def test_origin_decisions_are_memoized(async_client: Client):
+    validated.clear()
+    for _ in range(3):
+        response = await async_client.get("/cors", headers={"origin": "https://dynamic.example"})
+        assert response.headers["access-control-allow-origin"] == "https://dynamic.example"
+    assert validated == ["https://dynamic.example"]
+
+
+async def test_preflight(async_client: Client):
+    headers = {
+        "origin": "https://example.com",
+        "access-control-request-method": "POST",
+        "access-control-request-headers": "Authorization, Content-Type",
+    }
+    for _ in range(2):
+        response = await async_client.options("/cors", headers=headers)
+        assert response.status_code == 201
+        assert response.headers["access-control-allow-origin"] == "https://example.com"
+        assert response.headers["access-control-allow-methods"] == "GET, POST"
+        assert response.headers["access-control-allow-headers"] == "Authorization, Content-Type"
+
+    response = await async_client.options("/cors", headers={**headers, "access-control-request-method": "DELETE"})
+    assert response.status_code == 400
+
+    response = await async_client.options("/cors", headers={**headers, "access-control-request-headers": "X-Other"})
+    assert response.status_code == 400
+
+    response = await async_client.options("/cors", headers={**headers, "origin": "https://other.example"})
+    assert response.status_code == 400
@@ -0,0 +1,90 @@
+import pytest
+
+from nexios import MakeConfig, NexiosApp, get_application
+from nexios.http import Request, Response
+from nexios.middlewares.csrf import CSRFMiddleware
+from nexios.testing import Client
+
+app: NexiosApp = get_application(config=MakeConfig({
+    "secret_key": "test-secret",
+    "csrf_enabled": True,
+    "csrf_required_urls": ["/csrf/forms/.*", "/csrf/submit", "(?i)/csrf/mixed"],
+}))
+
+
+@app.get("/csrf/page")
+async def page(req: Request, res: Response):
+    return res.text("page")
+
+
+@app.post("/csrf/submit")
+async def submit(req: Request, res: Response):
+    return res.text("submitted")
+
+
+@app.post("/csrf/forms/{name}")
+async def form(req: Request, res: Response):
+    return res.text("form")
+
+
+@app.post("/csrf/MIXED")
+async def mixed(req: Request, res: Response):
+    return res.text("mixed")
+
+
+@app.post("/csrf/open")
+async def open_route(req: Request, res: Response):
+    return res.text("open")
+
+
+@pytest.fixture
+async def async_client():
+    async with Client(app) as c:
+        yield c
+
+
+async def test_token_is_issued_once_and_checked(async_client: Client):
+    response = await async_client.get("/csrf/page")
+    token = response.cookies["csrftoken"]
+    assert token
+
+    # A valid cookie is kept rather than replaced on every response.
+    response = await async_client.get("/csrf/page")
+    assert "set-cookie" not in response.headers
+
+    for path in ("/csrf/submit", "/csrf/forms/signup"):
+        response = await async_client.post(path, headers={"X-CSRFToken": token})
+        assert response.status_code == 200
+        assert "set-cookie" not in response.headers
+
+        response = await async_client.post(path)
+        assert response.status_code == 403
+
+        response = await async_client.post(path, headers={"X-CSRFToken": token + "x"})
+        assert response.status_code == 403
+
+    response = await async_client.post("/csrf/open")
+    assert response.status_code == 200
+
+
+async def test_forged_cookie_is_rejected_and_replaced(async_client: Client):
+    async_client.cookies.set("csrftoken", "forged.0000")
+    response = await async_client.post("/csrf/submit", headers={"X-CSRFToken": "forged.0000"})
+    assert response.status_code == 403
+
+    response = await async_client.get("/csrf/page")
+    assert response.cookies["csrftoken"] != "forged.0000"
+
+
+async def test_inline_flags_and_groups_keep_their_meaning(async_client: Client):
+    # Global inline flags can't be joined into an alternation on Python 3.11+.
+    response = await async_client.post("/csrf/MIXED")
+    assert response.status_code == 403
+
+    patterns = CSRFMiddleware._compile_urls(["/a", "/b/.*", "(?i)/webhook/.*", r"/(x+)/\1"])
+    assert len(patterns) == 3
+    assert CSRFMiddleware._matches(patterns, "/b/c")
+    assert CSRFMiddleware._matches(patterns, "/WEBHOOK/github")
+    assert CSRFMiddleware._matches(patterns, "/xx/xx")
+    assert not CSRFMiddleware._matches(patterns, "/xx/x")
+    assert not CSRFMiddleware._matches(patterns, "/ab")
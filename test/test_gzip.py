@@ -0,0 +1,147 @@
+import gzip
+import zlib
+from pathlib import Path
+
+import pytest
+
+from nexios import NexiosApp, get_application
+from nexios.http import Request, Response
+from nexios.middlewares.gzip import GzipMiddleware, accepts_gzip
+from nexios.testing import Client
+
+app: NexiosApp = get_application()
+gzip_middleware = GzipMiddleware()
+app.add_middleware(gzip_middleware)
+
+ROWS = [{"id": i, "name": "row"} for i in range(200)]
+
+
+@app.get("/gzip/json")
+async def big_json(req: Request, res: Response):
+    return res.json(ROWS)
+
+
+@app.get("/gzip/small")
+async def small_json(req: Request, res: Response):
+    return res.json({"ok": True})
+
+
+@app.get("/gzip/ndjson")
+async def ndjson(req: Request, res: Response):
+    return res.ndjson(ROWS, buffer_size=1024)
+
+
+@app.get("/gzip/file")
+async def file(req: Request, res: Response):
+    return res.file(str(Path(__file__).parent / "static" / "example.txt"))
+
+
+@app.get("/gzip/encoded")
+async def encoded(req: Request, res: Response):
+    return res.resp(gzip.compress(b"x" * 1000), content_type="text/plain").header("content-encoding", "gzip")
+
+
+@pytest.fixture
+async def async_client():
+    async with Client(app) as c:
+        yield c
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("gzip;q=0, br")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("*, gzip;q=0")
+
+
+async def test_buffered_response_is_compressed(async_client: Client):
+    response = await async_client.get("/gzip/json", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < 1000
+    assert response.json() == ROWS
+
+    response = await async_client.get("/gzip/json", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response = await async_client.get("/gzip/small", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def _call(path: str, headers: list):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": headers, "server": ("test", 80), "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+    return messages
+
+
+async def test_streamed_response_is_compressed_per_chunk():
+    messages = await _call("/gzip/ndjson", [(b"accept-encoding", b"gzip")])
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    raw = [message["body"] for message in messages[1:] if message.get("body")]
+    assert len(raw) > 2
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # Every chunk is flushed, so each one decodes to whole rows on its own.
+    first = decompressor.decompress(raw[0])
+    assert first and first.endswith(b"\n")
+    body = first + b"".join(decompressor.decompress(chunk) for chunk in raw[1:])
+    assert body.count(b"\n") == len(ROWS)
+    assert decompressor.eof
+
+
+async def test_file_and_encoded_responses(async_client: Client):
+    response = await async_client.get("/gzip/file", headers={"accept-encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.text == (Path(__file__).parent / "static" / "example.txt").read_text()
+
+    assert response.headers["etag"].startswith("W/")
+    assert "accept-ranges" not in response.headers
+
+    # A resume with that ETag can't be spliced onto the gzip body.
+    response = await async_client.get(
+        "/gzip/file", headers={"range": "bytes=0-9", "if-range": response.headers["etag"], "accept-encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.text == (Path(__file__).parent / "static" / "example.txt").read_text()
+
+    response = await async_client.get("/gzip/encoded", headers={"accept-encoding": "gzip"})
+    # The client undoes one layer of gzip; a second layer would still show.
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"x" * 1000
+
+
+async def test_large_bodies_are_offloaded(async_client: Client, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(gzip_middleware, "threadpool_threshold", 1024)
+    monkeypatch.setattr(gzip_middleware, "large_body_size", 2048)
+    monkeypatch.setattr(gzip_middleware, "stats", type(gzip_middleware.stats)())
+
+    response = await async_client.get("/gzip/json", headers={"accept-encoding": "gzip"})
+    assert response.json() == ROWS
+    stats = gzip_middleware.stats
+    assert stats["compressed"] == stats["offloaded"] == 1
+    assert stats["level_large_body"] == stats["level_4"] == 1
+    assert stats["bytes_out"] < stats["bytes_in"]
+
+    await async_client.get("/gzip/small", headers={"accept-encoding": "gzip"})
+    assert stats["skipped"] == 1
+
+
+def test_level_drops_when_workers_are_busy(monkeypatch: pytest.MonkeyPatch):
+    assert gzip_middleware.choose_level(100) == gzip_middleware.compression_level
+    monkeypatch.setattr(gzip_middleware, "_pending", gzip_middleware.max_workers)
+    assert gzip_middleware.choose_level(100) == 1
@@ -0,0 +1,112 @@
+import anyio
+import pytest
+
+from nexios import NexiosApp, get_application
+from nexios.hooks import cache_response
+from nexios.http import Request, Response
+from nexios.testing import Client
+
+app: NexiosApp = get_application()
+calls = []
+
+
+now = [0.0]
+
+
+@app.get("/hooks/cached/{item}")
+@cache_response(max_size=2, ttl=60, vary=["accept-language"], clock=lambda: now[0])
+async def cached_item(req: Request, res: Response):
+    calls.append(req.path_params["item"])
+    await anyio.sleep(0.05)
+    return res.json({"item": req.path_params["item"], "call": len(calls)}, headers={"x-cached": "1"})
+
+
+@app.get("/hooks/cookie")
+@cache_response()
+async def cookie_item(req: Request, res: Response):
+    calls.append("cookie")
+    return res.set_cookie("session", "abc").text("hi")
+
+
+@pytest.fixture
+async def async_client():
+    cached_item.cache_clear()
+    calls.clear()
+    now[0] = 0.0
+    async with Client(app) as c:
+        yield c
+
+
+async def test_cache_hit_replays_response(async_client: Client):
+    first = await async_client.get("/hooks/cached/a")
+    second = await async_client.get("/hooks/cached/a")
+    assert first.json() == second.json() == {"item": "a", "call": 1}
+    assert second.headers["x-cached"] == "1"
+    assert second.headers["content-type"] == "application/json"
+    assert calls == ["a"]
+
+    await async_client.get("/hooks/cached/a", headers={"accept-language": "fr"})
+    await async_client.get("/hooks/cached/a?page=2")
+    assert calls == ["a", "a", "a"]
+
+
+async def test_cache_single_flight(async_client: Client):
+    results = []
+
+    async def fetch():
+        results.append((await async_client.get("/hooks/cached/b")).json())
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(fetch)
+    assert calls == ["b"]
+    assert results == [{"item": "b", "call": 1}] * 5
+
+
+async def test_cache_eviction_and_ttl(async_client: Client):
+    for item in ("a", "b", "c", "a"):
+        await async_client.get(f"/hooks/cached/{item}")
+    assert calls == ["a", "b", "c", "a"]
+
+    now[0] += 120
+    await async_client.get("/hooks/cached/c")
+    assert calls[-1] == "c" and len(calls) == 5
+
+
+async def test_cache_skips_cookies(async_client: Client):
+    await async_client.get("/hooks/cookie")
+    await async_client.get("/hooks/cookie")
+    assert calls == ["cookie", "cookie"]
+
+
+@app.get("/hooks/etag")
+@cache_response()
+async def etag_item(req: Request, res: Response):
+    calls.append("etag")
+    return res.cache(max_age=60).json({"etag": True})
+
+
+@app.get("/hooks/versioned")
+@cache_response()
+async def versioned_item(req: Request, res: Response):
+    calls.append("versioned")
+    if res.check_etag(req, "v1"):
+        return res
+    return res.json({"version": 1})
+
+
+async def test_cache_hits_keep_etags(async_client: Client):
+    etag_item.cache_clear()
+    versioned_item.cache_clear()
+    for path in ("/hooks/etag", "/hooks/versioned"):
+        first = await async_client.get(path)
+        etag = first.headers["etag"]
+        second = await async_client.get(path)
+        assert second.headers["etag"] == etag
+        assert second.content == first.content
+
+        response = await async_client.get(path, headers={"if-none-match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert calls == ["etag", "versioned"]
@@ -1,6 +1,7 @@
 from nexios import NexiosApp
 from nexios.http import Request, Response
 from nexios import get_application
+from nexios.middlewares.common import CommonMiddleware
 from nexios.testing import Client
 import pytest
 
@@ -126,4 +127,27 @@ async def test_middleware_exception_handling(async_client:Client):
 
     response = await async_client.get("/error-route")
     assert response.status_code == 500
-    assert response.text == "Handled Error"
\ No newline at end of file
+    assert response.text == "Handled Error"
+
+async def test_common_middleware_headers(async_client:Client):
+
+    app.router.routes.clear()
+    app.http_middlewares.clear()
+
+    app.add_middleware(CommonMiddleware())
+
+    @app.route("/common")
+    async def common_route(request: Request, response :Response):
+        return response.text("OK")
+
+    response = await async_client.get("/common", headers={"User-Agent": "tests"})
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
+    assert "Content-Security-Policy" not in response.headers
+    assert "X-User-Agent" not in response.headers
+
+    app.http_middlewares.clear()
+    app.add_middleware(CommonMiddleware(echo_user_agent=True))
+    response = await async_client.get("/common", headers={"User-Agent": "tests"})
+    assert response.headers["X-User-Agent"] == "tests"
@@ -0,0 +1,231 @@
+from nexios import get_application, NexiosApp
+import pytest
+import hashlib
+import gzip
+import json
+import zlib
+from nexios.http import Request, Response
+from nexios.testing import Client
+
+app: NexiosApp = get_application()
+
+
+@app.post("/request/parts")
+async def stream_parts(req: Request, res: Response):
+    parts = []
+    async for part in req.iter_parts():
+        if part.is_file:
+            digest = hashlib.sha256()
+            size = 0
+            async for chunk in part.stream():
+                digest.update(chunk)
+                size += len(chunk)
+            parts.append({"name": part.name, "filename": part.filename, "size": size, "sha256": digest.hexdigest()})
+        else:
+            parts.append({"name": part.name, "value": await part.text()})
+    return res.json(parts)
+
+
+@app.post("/request/parts/skip")
+async def skip_parts(req: Request, res: Response):
+    names = [part.name async for part in req.iter_parts()]
+    return res.json(names)
+
+
+@pytest.fixture
+async def async_client():
+    async with Client(app) as c:
+        yield c
+
+
+async def test_iter_parts_streams_files_and_fields(async_client: Client):
+    payload = b"x" * (256 * 1024)
+    response = await async_client.post(
+        "/request/parts",
+        data={"title": "report"},
+        files={"upload": ("big.bin", payload, "application/octet-stream")},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "title", "value": "report"},
+        {
+            "name": "upload",
+            "filename": "big.bin",
+            "size": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        },
+    ]
+
+
+async def test_iter_parts_skips_unread_bodies(async_client: Client):
+    response = await async_client.post(
+        "/request/parts/skip",
+        data={"a": "1", "b": "2"},
+        files={"c": ("c.txt", b"content", "text/plain")},
+    )
+    assert response.json() == ["a", "b", "c"]
+
+
+async def test_iter_parts_rejects_bad_bodies(async_client: Client):
+    response = await async_client.post("/request/parts", json={"a": 1})
+    assert response.status_code == 400
+
+    body = (
+        b"--xyz\r\n"
+        b'Content-Disposition: form-data; name="upload"; filename="a.txt"\r\n'
+        b"Content-Type: text/plain\r\n\r\n"
+        b"partial"
+    )
+    response = await async_client.post(
+        "/request/parts", content=body, headers={"content-type": "multipart/form-data; boundary=xyz"}
+    )
+    assert response.status_code == 400
+
+    response = await async_client.post(
+        "/request/parts/skip", content=body[:20], headers={"content-type": "multipart/form-data; boundary=xyz"}
+    )
+    assert response.status_code == 400
+
+
+@app.post("/request/limited", max_body_size=16)
+async def limited_body(req: Request, res: Response):
+    return res.json({"size": len(await req.body())})
+
+
+@app.post("/request/unlimited")
+async def unlimited_body(req: Request, res: Response):
+    return res.json({"size": len(await req.body())})
+
+
+@app.post("/request/ignored")
+async def ignored_body(req: Request, res: Response):
+    return res.text("ok")
+
+
+@app.post("/request/form")
+async def parse_form(req: Request, res: Response):
+    form = await req.form_data
+    return res.json(dict(form))
+
+
+async def test_route_body_limit_rejects_on_content_length(async_client: Client):
+    response = await async_client.post("/request/limited", content=b"x" * 32)
+    assert response.status_code == 413
+
+    response = await async_client.post("/request/limited", content=b"x" * 8)
+    assert response.json() == {"size": 8}
+
+
+async def test_route_body_limit_aborts_mid_stream(async_client: Client):
+    async def chunks():
+        yield b"x" * 10
+        yield b"x" * 10
+
+    response = await async_client.post("/request/limited", content=chunks())
+    assert response.status_code == 413
+
+
+async def test_app_wide_limits(async_client: Client, monkeypatch: pytest.MonkeyPatch):
+    config = app.config
+    monkeypatch.setitem(config._config, "max_body_size", 64)
+    monkeypatch.setitem(config._config, "max_form_fields", 2)
+
+    response = await async_client.post("/request/unlimited", content=b"x" * 65)
+    assert response.status_code == 413
+
+    response = await async_client.post("/request/form", data={"a": "1", "b": "2", "c": "3"})
+    assert response.status_code == 413
+
+    response = await async_client.post("/request/form", data={"a": "1", "b": "2"})
+    assert response.json() == {"a": "1", "b": "2"}
+
+    response = await async_client.post("/request/ignored", content=b"x" * 65)
+    assert response.status_code == 413
+
+    monkeypatch.setitem(config._config, "max_form_fields", 0)
+    response = await async_client.post("/request/form", data={"a": "1"})
+    assert response.status_code == 413
+
+
+@app.post("/request/json")
+async def echo_json(req: Request, res: Response):
+    return res.json(await req.json)
+
+
+async def test_compressed_body_is_decoded(async_client: Client, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(app.config._config, "decompress_requests", True)
+    body = gzip.compress(json.dumps({"items": list(range(100))}).encode())
+    response = await async_client.post(
+        "/request/json", content=body, headers={"content-encoding": "gzip", "content-type": "application/json"}
+    )
+    assert response.json() == {"items": list(range(100))}
+
+    body = zlib.compress(b'{"ok": true}')
+    response = await async_client.post("/request/json", content=body, headers={"content-encoding": "deflate"})
+    assert response.json() == {"ok": True}
+
+
+async def test_compressed_body_guards(async_client: Client, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(app.config._config, "decompress_requests", True)
+    bomb = gzip.compress(b"\0" * (8 * 1024 * 1024))
+    response = await async_client.post("/request/unlimited", content=bomb, headers={"content-encoding": "gzip"})
+    assert response.status_code == 413
+
+    response = await async_client.post("/request/unlimited", content=b"data", headers={"content-encoding": "br"})
+    assert response.status_code == 415
+
+
+async def test_compressed_body_members_and_truncation(async_client: Client, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(app.config._config, "decompress_requests", True)
+    body = gzip.compress(b'{"a": ') + gzip.compress(b'"b"}')
+    response = await async_client.post("/request/json", content=body, headers={"content-encoding": "gzip"})
+    assert response.json() == {"a": "b"}
+
+    body = gzip.compress(b"x" * 1000)
+    response = await async_client.post(
+        "/request/unlimited", content=body[: len(body) // 2], headers={"content-encoding": "gzip"}
+    )
+    assert response.status_code == 400
+
+    body = zlib.compress(b'{"ok": true}') + b"junk"
+    response = await async_client.post("/request/json", content=body, headers={"content-encoding": "deflate"})
+    assert response.status_code == 400
+
+
+@app.post("/request/text")
+async def echo_text(req: Request, res: Response):
+    return res.json({"content_type": req.content_type, "charset": req.charset, "text": await req.text})
+
+
+async def test_content_type_is_parsed_once_with_charset(async_client: Client):
+    body = "café".encode("latin-1")
+    response = await async_client.post(
+        "/request/text", content=body, headers={"content-type": "Text/Plain; charset=ISO-8859-1"}
+    )
+    assert response.json() == {"content_type": "text/plain", "charset": "iso8859-1", "text": "café"}
+
+    body = json.dumps({"name": "café"}).encode("utf-16")
+    response = await async_client.post(
+        "/request/json", content=body, headers={"content-type": "application/json; charset=utf-16"}
+    )
+    assert response.json() == {"name": "café"}
+
+
+@app.get("/request/cookies")
+async def read_cookies(req: Request, res: Response):
+    return res.json({"session_id": req.cookies.get("session_id"), "count": len(req.cookies)})
+
+
+async def test_cookies_are_parsed_lazily(async_client: Client):
+    from nexios.http.cookies_parser import RequestCookies
+
+    cookies = RequestCookies('_ga=GA1.2; session_id="abc\\073def"; flag')
+    assert cookies._raw is None
+    assert cookies["session_id"] == "abc;def"
+    assert list(cookies._values) == ["session_id"]
+    assert dict(cookies) == {"_ga": "GA1.2", "session_id": "abc;def", "": "flag"}
+
+    response = await async_client.get(
+        "/request/cookies", headers={"cookie": "_ga=GA1.2; _gid=GA1.3; session_id=xyz"}
+    )
+    assert response.json() == {"session_id": "xyz", "count": 3}
@@ -4,6 +4,7 @@ from nexios.http import Request,Response
 from nexios.testing import Client
 import datetime as dt
 import time
+from pathlib import Path
 app :NexiosApp = get_application()
 @app.get("/response/text")
 async def send_text_response(req: Request, res :Response):
@@ -45,9 +46,12 @@ async def send_header_response(req: Request, res :Response):
     
 
 
+STATIC_DIR = Path(__file__).parent / "static"
+
+
 @app.get("/response/files")
 async def send_file_response(req: Request, res :Response):
-    res.file("C:/Users/dunamix/Documents/Nexios/test/static/example.txt",content_disposition_type="attachment")
+    res.file(str(STATIC_DIR / "example.txt"),content_disposition_type="attachment")
     
     
 @app.get("/response/cookies")
@@ -134,3 +138,392 @@ async def test_set_cookies(async_client :Client, monkeypatch :pytest.MonkeyPatch
         response.headers["set-cookie"] == "mycookie=myvalue; Domain=localhost; expires=Thu, 22 Jan 2037 12:00:10 GMT; "
         "HttpOnly; Max-Age=10; Path=/; SameSite=none; Secure"
     )
+
+
+@app.get("/response/concurrent/{delay}")
+async def send_concurrent_response(req: Request, res :Response):
+    res.header("x-delay", req.path_params["delay"])
+    await anyio.sleep(float(req.path_params["delay"]))
+    return res.text(req.path_params["delay"])
+
+
+async def test_concurrent_responses_are_independent(async_client :Client):
+    results = {}
+
+    async def fetch(delay: str):
+        results[delay] = await async_client.get(f"/response/concurrent/{delay}")
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(fetch, "0.05")
+        tg.start_soon(fetch, "0")
+    for delay, response in results.items():
+        assert response.text == delay
+        assert response.headers["x-delay"] == delay
+
+
+@app.get("/response/switch")
+async def send_switched_response(req: Request, res :Response):
+    res.set_cookie("a", "1").set_cookie("b", "2").header("x-kept", "yes")
+    res.text("draft")
+    res.headers["x-view"] = "live"
+    assert res.has_header("X-Kept") and res.has_header("content-type") is False
+    return res.json({"ok": True})
+
+
+async def test_headers_survive_body_switches():
+    from nexios.http.response import JSONResponse
+
+    res = Response()
+    res.set_cookie("a", "1").set_cookie("b", "2").header("x-kept", "yes")
+    res.text("draft")
+    res.json({"ok": True}, headers={"x-extra": "1"})
+    assert res.headers.getlist("set-cookie")[0].startswith("a=1")
+    assert len(res.headers.getlist("set-cookie")) == 2
+    assert res.headers["x-kept"] == "yes"
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await res.get_response()({"type": "http"}, None, send)  # type: ignore
+    raw = dict(sent[0]["headers"])
+    assert raw[b"content-type"] == b"application/json"
+    assert raw[b"x-extra"] == b"1" and raw[b"x-kept"] == b"yes"
+    assert [k for k, _ in sent[0]["headers"]].count(b"set-cookie") == 2
+    assert isinstance(res.get_response(), JSONResponse)
+
+
+async def test_headers_view_is_live(async_client :Client):
+    response = await async_client.get("/response/switch")
+    assert response.json() == {"ok": True}
+    assert response.headers["x-kept"] == "yes"
+    assert response.headers["x-view"] == "live"
+
+
+from nexios.http.response import JSONResponse, PreencodedResponse
+
+HEALTHY = PreencodedResponse.from_response(JSONResponse({"ok": True}))
+
+
+@app.get("/response/preencoded")
+async def send_preencoded_response(req: Request, res :Response):
+    if "tag" in req.query_params:
+        res.header("x-tag", req.query_params["tag"])
+    return res.make_response(HEALTHY)
+
+
+async def test_preencoded_response(async_client :Client):
+    for _ in range(2):
+        response = await async_client.get("/response/preencoded")
+        assert response.json() == {"ok": True}
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-length"] == "12"
+        assert "x-tag" not in response.headers
+
+    response = await async_client.get("/response/preencoded?tag=1")
+    assert response.headers["x-tag"] == "1"
+    assert response.json() == {"ok": True}
+    assert HEALTHY._start_message["headers"] == (
+        (b"content-length", b"12"),
+        (b"content-type", b"application/json"),
+    )
+
+
+async def _call_file_response(scope_extra: dict, headers: list = []):
+    from nexios.http.response import FileResponse
+
+    scope = {"type": "http", "headers": headers, **scope_extra}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await FileResponse(STATIC_DIR / "example.txt")(scope, None, send)  # type: ignore
+    return sent
+
+
+async def test_file_response_zerocopy():
+    size = (STATIC_DIR / "example.txt").stat().st_size
+    sent = await _call_file_response({"extensions": {"http.response.zerocopy": {}}})
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.zerocopy"]
+    assert sent[1]["offset"] == 0 and sent[1]["count"] == size and sent[1]["more_body"] is False
+    assert sent[1]["file"].name == str(STATIC_DIR / "example.txt")
+
+    sent = await _call_file_response({"extensions": {"http.response.zerocopy": {}}}, [(b"range", b"bytes=12-19")])
+    assert sent[0]["status"] == 206
+    assert (sent[1]["offset"], sent[1]["count"]) == (12, 8)
+
+
+async def test_zerocopy_through_middleware():
+    # The default middlewares relay the body, so they must hide zerocopy from the handler.
+    sent = []
+    received = []
+
+    async def receive():
+        if received:
+            await anyio.sleep_forever()
+        received.append(True)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    extensions = {"http.response.zerocopy": {}}
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/response/files", "raw_path": b"/response/files", "root_path": "",
+        "query_string": b"", "headers": [], "server": ("test", 80), "client": ("test", 1),
+        "extensions": extensions,
+    }
+    await app(scope, receive, send)
+    assert sent[0]["status"] == 200
+    assert all(message["type"] != "http.response.zerocopy" for message in sent)
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert body == (STATIC_DIR / "example.txt").read_bytes()
+    assert "http.response.zerocopy" in extensions
+
+
+async def test_file_response_chunks(monkeypatch :pytest.MonkeyPatch):
+    from nexios.http.response import FileResponse
+
+    monkeypatch.setattr(FileResponse, "chunk_size", 16)
+    monkeypatch.setattr(FileResponse, "max_chunk_size", 64)
+    content = (STATIC_DIR / "example.txt").read_bytes()
+    sent = await _call_file_response({})
+    chunks = [m["body"] for m in sent[1:]]
+    assert b"".join(chunks) == content
+    assert [len(c) for c in chunks[:4]] == [16, 32, 64, 64]
+    assert sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+
+async def test_file_response_mmap_ranges(monkeypatch :pytest.MonkeyPatch):
+    from nexios.http.response import FileResponse
+
+    monkeypatch.setattr(FileResponse, "mmap_threshold", 1)
+    content = (STATIC_DIR / "example.txt").read_bytes()
+
+    sent = await _call_file_response({})
+    assert all(isinstance(m["body"], memoryview) for m in sent[1:-1])
+    assert b"".join(bytes(m["body"]) for m in sent[1:]) == content
+
+    sent = await _call_file_response({}, [(b"range", b"bytes=-10")])
+    assert sent[0]["status"] == 206
+    assert b"".join(bytes(m["body"]) for m in sent[1:]) == content[-10:]
+
+    # Overlapping and adjacent ranges collapse into one.
+    sent = await _call_file_response({}, [(b"range", b"bytes=0-4, 3-9, 10-14")])
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-range"] == f"bytes 0-14/{len(content)}".encode()
+    assert b"".join(bytes(m["body"]) for m in sent[1:]) == content[:15]
+
+    sent = await _call_file_response({}, [(b"range", b"bytes=20-24, 0-4")])
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-type"].startswith(b"multipart/byteranges")
+    body = b"".join(bytes(m["body"]) for m in sent[1:])
+    assert int(headers[b"content-length"]) == len(body)
+    assert body.index(content[:5]) < body.index(content[20:25])
+    assert body.endswith(b"--\r\n")
+
+
+async def test_file_response_unsatisfiable_range():
+    sent = await _call_file_response({}, [(b"range", b"bytes=999999-")])
+    assert sent[0]["status"] == 416
+    assert dict(sent[0]["headers"])[b"content-length"] == b"0"
+
+
+async def test_file_response_conditional_get(async_client :Client):
+    response = await async_client.get("/response/files")
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    response = await async_client.get("/response/files", headers={"if-none-match": f'W/{etag}, "other"'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = await async_client.get("/response/files", headers={"if-modified-since": last_modified})
+    assert response.status_code == 304
+
+    response = await async_client.get(
+        "/response/files", headers={"if-none-match": '"stale"', "if-modified-since": last_modified}
+    )
+    assert response.status_code == 200
+
+
+async def test_file_response_if_range(monkeypatch :pytest.MonkeyPatch):
+    from nexios.http import response as response_module
+
+    opened = []
+    real_open_file = response_module.anyio.open_file
+
+    async def tracking_open_file(*args, **kwargs):
+        opened.append(args[0])
+        return await real_open_file(*args, **kwargs)
+
+    sent = await _call_file_response({})
+    etag = dict(sent[0]["headers"])[b"etag"]
+
+    monkeypatch.setattr(response_module.anyio, "open_file", tracking_open_file)
+    sent = await _call_file_response({"method": "GET"}, [(b"if-none-match", etag)])
+    assert sent[0]["status"] == 304 and opened == []
+
+    sent = await _call_file_response({}, [(b"range", b"bytes=0-4"), (b"if-range", etag)])
+    assert sent[0]["status"] == 206
+
+    sent = await _call_file_response({}, [(b"range", b"bytes=0-4"), (b"if-range", b'"changed"')])
+    assert sent[0]["status"] == 200
+
+
+serialized = []
+
+
+@app.get("/response/etag/cached")
+async def send_cached_response(req: Request, res :Response):
+    res.cache(max_age=60)
+    return res.json({"items": [1, 2, 3]})
+
+
+@app.get("/response/etag/versioned")
+async def send_versioned_response(req: Request, res :Response):
+    if res.check_etag(req, "post-1:v2"):
+        return res
+
+    async def body():
+        serialized.append(1)
+        yield "streamed"
+
+    return res.stream(body())  # type: ignore
+
+
+async def test_cache_sets_etag_and_answers_304(async_client :Client):
+    response = await async_client.get("/response/etag/cached")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"') and len(etag) == 36
+    assert "max-age=60" in response.headers["cache-control"]
+
+    response = await async_client.get("/response/etag/cached", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+async def test_check_etag_skips_the_body(async_client :Client):
+    serialized.clear()
+    response = await async_client.get("/response/etag/versioned")
+    assert response.text == "streamed"
+    etag = response.headers["etag"]
+    assert serialized == [1]
+
+    response = await async_client.get("/response/etag/versioned", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert serialized == [1]
+
+
+async def _collect_stream(response):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await response.stream_response(send)
+    return [m["body"] for m in sent[1:]]
+
+
+async def test_streaming_response_coalesces_chunks():
+    from nexios.http.response import FLUSH, StreamingResponse
+
+    async def rows():
+        for i in range(10):
+            yield f"{i},"
+        yield FLUSH
+        yield "tail"
+
+    bodies = await _collect_stream(StreamingResponse(rows(), buffer_size=8))
+    assert bodies == [b"0,1,2,3,", b"4,5,6,7,", b"8,9,", b"tail"]
+
+    bodies = await _collect_stream(StreamingResponse(rows()))
+    assert len(bodies) == 12 and b"".join(bodies) == b"0,1,2,3,4,5,6,7,8,9,tail"
+
+
+async def test_streaming_response_max_latency():
+    from nexios.http.response import StreamingResponse
+
+    async def slow_rows():
+        yield "a"
+        yield "b"
+        await anyio.sleep(0.2)
+        yield "c"
+
+    bodies = await _collect_stream(StreamingResponse(slow_rows(), buffer_size=1024, max_latency=0.02))
+    assert bodies == [b"ab", b"c"]
+
+
+@app.get("/response/ndjson")
+async def send_ndjson_response(req: Request, res :Response):
+    async def rows():
+        for i in range(3):
+            yield {"id": i}
+
+    return res.ndjson(rows())
+
+
+@app.get("/response/json-stream")
+async def send_json_stream_response(req: Request, res :Response):
+    if "envelope" in req.query_params:
+        return res.json_stream(({"id": i} for i in range(3)), envelope={"pagination": {"page": 1}})
+    return res.json_stream([])
+
+
+async def test_ndjson_response(async_client :Client):
+    response = await async_client.get("/response/ndjson")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text == '{"id":0}\n{"id":1}\n{"id":2}\n'
+
+
+async def test_json_stream_response(async_client :Client):
+    import json
+
+    response = await async_client.get("/response/json-stream?envelope=1")
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.text) == {"items": [{"id": 0}, {"id": 1}, {"id": 2}], "pagination": {"page": 1}}
+
+    response = await async_client.get("/response/json-stream")
+    assert response.json() == []
+
+
+async def test_ndjson_row_sources(monkeypatch :pytest.MonkeyPatch):
+    from nexios.http.response import NDJSONResponse
+
+    hops = []
+    run_sync = anyio.to_thread.run_sync
+
+    async def counting_run_sync(func, *args, **kwargs):
+        hops.append(func)
+        return await run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(anyio.to_thread, "run_sync", counting_run_sync)
+    monkeypatch.setattr(NDJSONResponse, "row_batch_size", 2)
+
+    bodies = await _collect_stream(NDJSONResponse([{"id": i} for i in range(5)]))
+    assert b"".join(bodies).count(b"\n") == 5
+    assert hops == []
+
+    bodies = await _collect_stream(NDJSONResponse({"id": i} for i in range(5)))
+    assert b"".join(bodies).count(b"\n") == 5
+    assert hops == []
+
+    bodies = await _collect_stream(NDJSONResponse(({"id": i} for i in range(5)), iterate_in_threadpool=True))
+    assert b"".join(bodies).count(b"\n") == 5
+    assert len(hops) == 3
+
+
+async def test_ndjson_sqlite_cursor():
+    import sqlite3
+    from nexios.http.response import NDJSONResponse
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table items (id integer)")
+    connection.executemany("insert into items values (?)", [(i,) for i in range(300)])
+    bodies = await _collect_stream(NDJSONResponse(connection.execute("select id from items")))
+    assert b"".join(bodies).count(b"\n") == 300
+    connection.close()
@@ -0,0 +1,99 @@
+import anyio
+import pytest
+
+from nexios import NexiosApp, get_application
+from nexios.http import Request, Response
+from nexios.http.sse import EventSourceResponse, HeartbeatScheduler, ServerSentEvent
+from nexios.testing import Client
+
+app: NexiosApp = get_application()
+
+
+@app.get("/sse/events")
+async def stream_events(req: Request, res: Response):
+    async def events(last_event_id):
+        start = int(last_event_id) + 1 if last_event_id else 1
+        for i in range(start, 4):
+            yield ServerSentEvent({"n": i}, event="tick", id=i)
+
+    return res.sse(events, retry=1000)
+
+
+@pytest.fixture
+async def async_client():
+    async with Client(app) as c:
+        yield c
+
+
+def test_event_encoding():
+    assert ServerSentEvent("a\nb", event="msg", id=7).encode() == b"id: 7\nevent: msg\ndata: a\ndata: b\n\n"
+    assert ServerSentEvent(comment="hi").encode() == b": hi\n\n"
+    assert ServerSentEvent(comment="a\rb\r\nc").encode() == b": a\n: b\n: c\n\n"
+    for field in ("id", "event"):
+        for value in ("a\nretry: 1", "a\rb", "a\0b"):
+            with pytest.raises(ValueError):
+                ServerSentEvent("x", **{field: value}).encode()
+
+
+async def test_sse_stream_and_resume(async_client: Client):
+    response = await async_client.get("/sse/events")
+    assert response.headers["content-type"] == "text/event-stream; charset=utf-8"
+    assert response.text == (
+        "retry: 1000\n\n"
+        'id: 1\nevent: tick\ndata: {"n":1}\n\n'
+        'id: 2\nevent: tick\ndata: {"n":2}\n\n'
+        'id: 3\nevent: tick\ndata: {"n":3}\n\n'
+    )
+
+    response = await async_client.get("/sse/events", headers={"last-event-id": "2"})
+    assert response.text == 'retry: 1000\n\nid: 3\nevent: tick\ndata: {"n":3}\n\n'
+
+
+async def test_shared_heartbeat():
+    scheduler = HeartbeatScheduler(interval=0.02)
+
+    async def slow_events():
+        await anyio.sleep(0.1)
+        yield "done"
+
+    async def receive():
+        await anyio.sleep_forever()
+
+    outputs = [[], []]
+
+    async def run(index):
+        async def send(message):
+            outputs[index].append(message.get("body"))
+
+        response = EventSourceResponse(slow_events(), heartbeat=scheduler)
+        await response({"type": "http", "headers": []}, receive, send)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(run, 0)
+        tg.start_soon(run, 1)
+        await anyio.sleep(0.05)
+        assert len(scheduler) == 2
+    for output in outputs:
+        assert b": ping\n\n" in output
+        assert output[-2:] == [b"data: done\n\n", b""]
+    assert len(scheduler) == 0 and scheduler._handle is None
+
+
+async def test_sse_stops_on_disconnect():
+    async def endless():
+        while True:
+            yield "x"
+            await anyio.sleep(0.01)
+
+    async def receive():
+        await anyio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    with anyio.fail_after(1):
+        await EventSourceResponse(endless(), heartbeat=None)({"type": "http", "headers": []}, receive, send)
+    assert sent[0]["type"] == "http.response.start"
@@ -0,0 +1,148 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from nexios import NexiosApp, get_application
+from nexios.routing import Routes
+from nexios.static import StaticFilesHandler
+from nexios.testing import Client
+
+SCRIPT = b"console.log('hello');" * 50
+
+try:
+    import brotli  # type: ignore
+
+    BROTLI_SCRIPT = brotli.compress(SCRIPT)
+except ImportError:
+    # Without brotli installed the client leaves br bodies alone.
+    brotli = None
+    BROTLI_SCRIPT = b"brotli bytes"
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path) -> Path:
+    (tmp_path / "app.js").write_bytes(SCRIPT)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(SCRIPT))
+    (tmp_path / "app.js.br").write_bytes(BROTLI_SCRIPT)
+    (tmp_path / "plain.txt").write_text("plain")
+    return tmp_path
+
+
+@pytest.fixture
+async def async_client(static_dir: Path):
+    app: NexiosApp = get_application()
+    handler = StaticFilesHandler(static_dir, url_prefix="/static/")
+    app.add_route(Routes("/static/{path:path}", handler))
+    async with Client(app) as c:
+        yield c
+
+
+async def test_precompressed_sidecars(async_client: Client):
+    response = await async_client.get("/static/app.js", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert 'filename="app.js"' in response.headers["content-disposition"]
+    assert response.content == SCRIPT
+
+    response = await async_client.get("/static/app.js", headers={"accept-encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["content-length"] == str(len(BROTLI_SCRIPT))
+
+    response = await async_client.get("/static/app.js", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == SCRIPT
+
+    response = await async_client.get("/static/plain.txt", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers and "vary" not in response.headers
+
+
+@pytest.fixture
+async def manifest_client(static_dir: Path):
+    app: NexiosApp = get_application()
+    handler = StaticFilesHandler(static_dir, url_prefix="/static/", manifest=True, max_memory_file_size=4096)
+    app.add_route(Routes("/static/{path:path}", handler))
+    async with Client(app) as c:
+        yield c, handler
+
+
+async def test_manifest_serves_small_files_from_memory(manifest_client, static_dir: Path):
+    client, handler = manifest_client
+    response = await client.get("/static/plain.txt")
+    assert response.status_code == 200
+    assert response.text == "plain"
+    assert response.headers["content-length"] == "5"
+    assert response.headers["content-type"].startswith("text/plain")
+    etag = response.headers["etag"]
+
+    (static_dir / "plain.txt").unlink()
+    # Served from memory, without touching the disk again.
+    response = await client.get("/static/plain.txt")
+    assert response.text == "plain"
+    assert handler._memory_size == 5
+
+    response = await client.get("/static/plain.txt", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = await client.get("/static/app.js", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == SCRIPT
+
+    response = await client.get("/static/missing.txt")
+    assert response.status_code == 404
+
+    handler.refresh()
+    assert handler._memory_size == 0
+    response = await client.get("/static/plain.txt")
+    assert response.status_code == 404
+
+
+async def test_manifest_large_files_and_eviction(manifest_client, static_dir: Path):
+    client, handler = manifest_client
+    (static_dir / "big.txt").write_bytes(b"b" * 10000)
+    handler.refresh()
+    response = await client.get("/static/big.txt")
+    assert response.content == b"b" * 10000
+    assert handler._memory_size == 0
+
+    handler.memory_cache_size = 8
+    await client.get("/static/plain.txt")
+    await client.get("/static/app.js.gz")
+    assert handler._memory_size <= 8
+    assert list(handler._memory) == [(str(static_dir / "plain.txt"), None, False)]
+
+    response = await client.get("/static/../plain.txt")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("manifest", [False, True])
+async def test_hashed_urls(static_dir: Path, manifest: bool):
+    app: NexiosApp = get_application()
+    handler = StaticFilesHandler(static_dir, url_prefix="/static/", manifest=manifest, hashed_urls=True)
+    app.add_route(Routes("/static/{path:path}", handler, name="static"))
+
+    url = str(app.static_url("static", "app.js"))
+    assert url.startswith("/static/app.") and url.endswith(".js") and url != "/static/app.js"
+    assert app.static_url("static", "unknown.js") == "/static/unknown.js"
+    with pytest.raises(ValueError):
+        app.static_url("missing", "app.js")
+
+    async with Client(app) as client:
+        response = await client.get(url, headers={"accept-encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == SCRIPT
+
+        response = await client.get("/static/app.js")
+        assert response.content == SCRIPT
+        assert "immutable" not in response.headers.get("cache-control", "")
+
+        (static_dir / "app.js").write_bytes(SCRIPT + b"//")
+        handler.refresh()
+        assert str(app.static_url("static", "app.js")) != url
+        response = await client.get(url)
+        assert response.status_code == 404